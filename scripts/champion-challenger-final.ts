@@ -152,6 +152,13 @@ async function trainChampionModel(): Promise<ModelResults> {
 """Train champion model with concernLevel"""
 import pandas as pd
 import numpy as np
+# Intel-optimized scikit-learn kernels when scikit-learn-intelex is installed;
+# must run before the sklearn imports below
+try:
+    from sklearnex import patch_sklearn
+    patch_sklearn()
+except ImportError:
+    pass
 from sklearn.model_selection import TimeSeriesSplit
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import StandardScaler
@@ -160,7 +167,7 @@ import pickle
 import os
 
 def direction_accuracy(y_true, y_pred):
-    correct = np.sum(np.sign(y_true) == np.sign(y_pred))
+    correct = np.count_nonzero(np.sign(y_true) == np.sign(y_pred))
     return correct / len(y_true) * 100
 
 # Load data
@@ -174,22 +181,20 @@ exclude_cols = ['filingId', 'ticker', 'companyName', 'filingDate',
                 'actual7dReturn', 'actual30dReturn', 'actual7dAlpha', 'actual30dAlpha',
                 'marketCapCategory', 'riskScore', 'sentimentScore']  # EXCLUDE legacy
 
-feature_cols = [col for col in df.columns if col not in exclude_cols]
+feature_cols = df.columns.difference(exclude_cols, sort=False)
 X = df[feature_cols].copy()
 
-# Handle categorical
-X['is_10K'] = (df['filingType'] == '10-K').astype(int)
-X['is_10Q'] = (df['filingType'] == '10-Q').astype(int)
+# Handle categorical (one-hot over the category codes, not per-row strings)
+dummies = pd.get_dummies(df['filingType'].astype('category'), dtype=np.int8)
+X[['is_10K', 'is_10Q']] = dummies.reindex(columns=['10-K', '10-Q'], fill_value=0).to_numpy()
 X = X.drop('filingType', axis=1)
 
 # Drop high-missing features
 missing_pct = X.isnull().sum() / len(X)
 X = X.drop(columns=missing_pct[missing_pct > 0.5].index.tolist())
 
-# Fill NaN
-for col in X.columns:
-    if X[col].isna().sum() > 0:
-        X[col].fillna(X[col].median(), inplace=True)
+# Fill NaN (all column medians in one pass)
+X.fillna(X.median(numeric_only=True), inplace=True)
 
 # Cross-validation
 tscv = TimeSeriesSplit(n_splits=5)
@@ -250,7 +250,10 @@ def main(earnings_csv, short_interest_csv=None, volume_csv=None):
 
     # Load earnings data (cleaned)
     print(f"\n📊 Loading earnings data from {earnings_csv}...")
-    df = pd.read_csv(earnings_csv)
+    if earnings_csv.endswith('.parquet'):
+        df = pd.read_parquet(earnings_csv)
+    else:
+        df = pd.read_csv(earnings_csv)
     df['filingDate'] = pd.to_datetime(df['filingDate'])
     df = df.sort_values('filingDate')
 
@@ -259,7 +262,10 @@ def main(earnings_csv, short_interest_csv=None, volume_csv=None):
     # Load short interest data if available
     if short_interest_csv and pd.io.common.file_exists(short_interest_csv):
         print(f"\n📊 Loading short interest data from {short_interest_csv}...")
-        si_df = pd.read_csv(short_interest_csv)
+        if short_interest_csv.endswith('.parquet'):
+            si_df = pd.read_parquet(short_interest_csv, columns=['ticker', 'filingDate', 'short_interest'])
+        else:
+            si_df = pd.read_csv(short_interest_csv)
 
         # Merge on ticker and filing date
         si_df['filingDate'] = pd.to_datetime(si_df['filingDate'])
@@ -273,7 +279,10 @@ def main(earnings_csv, short_interest_csv=None, volume_csv=None):
     # Load volume data if available
     if volume_csv and pd.io.common.file_exists(volume_csv):
         print(f"\n📊 Loading volume data from {volume_csv}...")
-        vol_df = pd.read_csv(volume_csv)
+        if volume_csv.endswith('.parquet'):
+            vol_df = pd.read_parquet(volume_csv)
+        else:
+            vol_df = pd.read_csv(volume_csv)
 
         # Merge on filingId (only raw columns that exist)
         df = df.merge(
@@ -524,7 +533,7 @@ if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Usage: python3 train-multi-factor-model.py <earnings_csv> [short_interest_csv] [volume_csv]")
         print("\nExample:")
-        print("  python3 train-multi-factor-model.py model-features-final-clean.csv short-interest-filings.csv prefiling-volume-data.csv")
+        print("  python3 train-multi-factor-model.py model-features-final-clean.parquet short-interest-filings.parquet prefiling-volume-data.parquet")
         sys.exit(1)
 
     earnings_csv = sys.argv[1]
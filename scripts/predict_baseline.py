@@ -12,7 +12,7 @@ Returns:
     {"prediction": 1, "confidence": 0.67, "recommendation": "BUY"}
 """
 
-import pickle
+import joblib
 import json
 import sys
 import numpy as np
@@ -37,10 +37,8 @@ REQUIRED_FEATURES = [
 def load_model():
     """Load trained model and scaler"""
     try:
-        with open(MODEL_PATH, 'rb') as f:
-            model = pickle.load(f)
-        with open(SCALER_PATH, 'rb') as f:
-            scaler = pickle.load(f)
+        model = joblib.load(MODEL_PATH)
+        scaler = joblib.load(SCALER_PATH)
         return model, scaler
     except FileNotFoundError as e:
         print(json.dumps({
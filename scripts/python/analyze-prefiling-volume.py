@@ -17,10 +17,15 @@ BEFORE we know the earnings result - could be a leading indicator!
 
 import pandas as pd
 import numpy as np
+import pytz
+import requests
 import yfinance as yf
 from datetime import datetime, timedelta
+from functools import lru_cache
+import os
 import sys
 import json
+import orjson
 from scipy import stats
 import time
 
@@ -29,130 +34,235 @@ import time
 # ============================================================
 
 CACHE_FILE = 'prefiling-volume-cache.json'
+VOLUME_STORE_DIR = 'prefiling-volume-store'  # Raw daily volume, one Parquet file per ticker
+VOLUME_STORE_INDEX = os.path.join(VOLUME_STORE_DIR, 'coverage.json')  # ticker -> [start, end) fetched
 RATE_LIMIT_DELAY = 1.0  # Seconds between API calls
 LOOKBACK_DAYS = 30  # Volume in 30 days before filing
 BASELINE_DAYS = 90  # Compare to 90-day baseline
+NY_TZ = pytz.timezone('America/New_York')  # Resolved once, reused per filing
+
+# Metric names returned by fetch_prefiling_volume_batch, in order
+VOLUME_FIELDS = (
+    'avg_volume_30d_before',
+    'avg_volume_90d_baseline',
+    'abnormal_volume_ratio',
+    'volume_trend_30d_pct',
+    'max_spike_ratio',
+    'high_volume_days',
+    'volume_percentile',
+    'acceleration_ratio',
+)
+# Shared "no data" result - never mutated, so callers avoid None checks on the dict
+EMPTY_VOLUME_METRICS = dict.fromkeys(VOLUME_FIELDS)
 
 # ============================================================
 # DATA FETCHING
 # ============================================================
 
-def fetch_prefiling_volume(ticker, filing_date):
+# One HTTP session for all yfinance requests (keep-alive, shared cookies)
+SESSION = requests.Session()
+
+@lru_cache(maxsize=1024)
+def _get_ticker(ticker):
+    """Return a cached yf.Ticker bound to the shared session."""
+    return yf.Ticker(ticker, session=SESSION)
+
+_store_coverage = None
+_store_frames = {}
+
+def _load_store_coverage():
+    """Load the ticker -> fetched date range index of the volume store."""
+    global _store_coverage
+    if _store_coverage is None:
+        try:
+            with open(VOLUME_STORE_INDEX, 'rb') as f:
+                _store_coverage = orjson.loads(f.read())
+        except FileNotFoundError:
+            _store_coverage = {}
+    return _store_coverage
+
+def get_volume_history(ticker, start_date, end_date):
     """
-    Fetch pre-filing volume metrics.
+    Daily volume for ticker in [start_date, end_date), served from the local store.
 
-    Returns:
-        - avg_volume_30d_before: Avg daily volume in 30 days before filing
-        - avg_volume_90d_baseline: Baseline avg over 90 days
-        - volume_trend_30d: Linear regression slope (rising or falling?)
-        - abnormal_volume_ratio: 30d avg / 90d baseline
-        - max_spike_ratio: Largest single-day spike in 30d period
-        - high_volume_days: Number of days with volume >1.5x baseline
-        - volume_percentile_30d: Where does 30d avg rank in 1-year history?
+    Each ticker's full fetched history is persisted as Parquet, so a new filing
+    date for a known ticker only hits yfinance when it falls outside the range
+    already on disk. On a miss the stored range is widened to cover the request.
+    Returns a one-column ('Volume') DataFrame with a tz-aware (NY) index.
     """
-    try:
-        filing_dt = pd.to_datetime(filing_date)
-
-        # Make filing_dt timezone-aware for comparison
-        if filing_dt.tzinfo is None:
-            filing_dt = filing_dt.tz_localize('America/New_York')
-
-        # Need data: 90 days before filing for baseline, plus 1 year for percentile
-        start_date = filing_dt - timedelta(days=400)  # Buffer for trading days
-        end_date = filing_dt
+    coverage = _load_store_coverage()
+    path = os.path.join(VOLUME_STORE_DIR, f'{ticker}.parquet')
+    start, end = start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+    covered = coverage.get(ticker)
+
+    if covered and covered[0] <= start and end <= covered[1]:
+        hist = _store_frames.get(ticker)
+        if hist is None:
+            hist = _store_frames[ticker] = pd.read_parquet(path)
+    else:
+        if covered:
+            start, end = min(start, covered[0]), max(end, covered[1])
 
-        ticker_obj = yf.Ticker(ticker)
-        hist = ticker_obj.history(start=start_date, end=end_date)
+        # Only Volume is used: skip dividend/split actions and drop OHLC up front
+        hist = _get_ticker(ticker).history(start=start, end=end, actions=False)
+        time.sleep(RATE_LIMIT_DELAY)
 
         if hist.empty or 'Volume' not in hist.columns:
-            return None
-
-        # Make sure both timestamps are timezone-aware
-        if hist.index.tz is None:
-            hist.index = hist.index.tz_localize('America/New_York')
+            return hist
 
-        # Filter to before filing date
-        hist = hist[hist.index < filing_dt]
+        hist = hist[['Volume']]
 
-        if len(hist) < 30:  # Need at least 30 days of data
-            return None
+        # Normalize to NY time so stored and requested bounds compare directly
+        if hist.index.tz is None:
+            hist.index = hist.index.tz_localize(NY_TZ)
+        else:
+            hist.index = hist.index.tz_convert(NY_TZ)
 
-        # Get last 30 trading days before filing
-        volume_30d = hist['Volume'].tail(30)
+        os.makedirs(VOLUME_STORE_DIR, exist_ok=True)
+        hist.to_parquet(path, engine='pyarrow', compression='zstd')
+        _store_frames[ticker] = hist
+        coverage[ticker] = [start, end]
+        with open(VOLUME_STORE_INDEX, 'wb') as f:
+            f.write(orjson.dumps(coverage))
 
-        # Get 90-day baseline (30-120 days before filing)
-        if len(hist) < 120:
-            volume_90d = hist['Volume'].head(len(hist) - 30)
-        else:
-            volume_90d = hist['Volume'].iloc[-120:-30]
+    index = hist.index
+    return hist.iloc[index.searchsorted(start_date, side='left'):index.searchsorted(end_date, side='left')]
 
-        if len(volume_90d) < 10:  # Need reasonable baseline
-            return None
+def compute_volume_metrics_batch(vol, starts, ends):
+    """
+    Pre-filing volume metrics for many filings sharing one volume series.
+
+    vol is a ticker's daily volume; each filing i sees the window
+    vol[starts[i]:ends[i]] (400 calendar days up to, not including, the
+    filing date). All filings are computed together from one prefix-sum
+    array and a strided 30-day window view, so there is no per-filing
+    pandas work. Returns an (n, len(VOLUME_FIELDS)) float array with NaN
+    where a metric is unavailable.
+    """
+    n = len(ends)
+    out = np.full((n, len(VOLUME_FIELDS)), np.nan)
+
+    # Need 30 days of data plus a baseline of at least 10 days
+    lengths = ends - starts
+    ok = lengths >= 40
+    if not ok.any():
+        return out
+
+    rows = np.flatnonzero(ok)
+    e, length = ends[ok], lengths[ok]
+
+    # Prefix sums: every window mean is two lookups
+    cs = np.concatenate(([0.0], np.cumsum(vol)))
+
+    # Last 30 trading days before filing, and the 90-day baseline
+    # (30-120 days before filing, or everything older when history is short)
+    avg_volume_30d = (cs[e] - cs[e - 30]) / 30
+    baseline_start = e - np.minimum(length, 120)
+    avg_volume_90d = (cs[e - 30] - cs[baseline_start]) / (e - 30 - baseline_start)
+    has_baseline = avg_volume_90d > 0
+    has_volume = avg_volume_30d > 0
+
+    windows = np.lib.stride_tricks.sliding_window_view(vol, 30)[e - 30]
+
+    # Volume trend: least-squares slope over days 0..29
+    days = np.arange(30) - 14.5
+    slope = windows @ days / (days @ days)
+
+    # Recent acceleration (last 10 days vs previous 20 days)
+    recent_10d = (cs[e] - cs[e - 10]) / 10
+    previous_20d = (cs[e - 10] - cs[e - 30]) / 20
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[rows, 0] = avg_volume_30d
+        out[rows, 1] = avg_volume_90d
+        out[rows, 2] = np.where(has_baseline, avg_volume_30d / avg_volume_90d, np.nan)
+        out[rows, 3] = np.where(has_volume, slope * 30 / avg_volume_30d * 100, np.nan)
+        out[rows, 4] = np.where(has_baseline, windows.max(axis=1) / avg_volume_90d, np.nan)
+        out[rows, 5] = np.count_nonzero(windows > (avg_volume_90d * 1.5)[:, None], axis=1)
+        out[rows, 7] = np.where(previous_20d > 0, recent_10d / previous_20d, np.nan)
+
+    # Volume percentile (vs 1-year history)
+    for row, end, n_days, avg in zip(rows, e, length, avg_volume_30d):
+        if n_days > 60:
+            out[row, 6] = stats.percentileofscore(vol[max(end - 252, end - n_days):end], avg)
+
+    return out
+
+def fetch_prefiling_volume_batch(ticker, filing_dates):
+    """
+    Fetch pre-filing volume metrics for all given filings of one ticker.
 
-        # Calculate metrics
-        avg_volume_30d = volume_30d.mean()
-        avg_volume_90d = volume_90d.mean()
-        abnormal_ratio = avg_volume_30d / avg_volume_90d if avg_volume_90d > 0 else None
+    Returns one dict per filing with:
+        - avg_volume_30d_before: Avg daily volume in 30 days before filing
+        - avg_volume_90d_baseline: Baseline avg over 90 days
+        - volume_trend_30d: Linear regression slope (rising or falling?)
+        - abnormal_volume_ratio: 30d avg / 90d baseline
+        - max_spike_ratio: Largest single-day spike in 30d period
+        - high_volume_days: Number of days with volume >1.5x baseline
+        - volume_percentile_30d: Where does 30d avg rank in 1-year history?
 
-        # Volume trend (rising or falling in last 30 days?)
-        days = np.arange(len(volume_30d))
-        slope, intercept = np.polyfit(days, volume_30d.values, 1)
-        trend_pct = (slope * 30) / avg_volume_30d * 100 if avg_volume_30d > 0 else None
+    Filings without enough data get EMPTY_VOLUME_METRICS (all fields None).
+    """
+    try:
+        filing_dts = pd.DatetimeIndex(filing_dates)
 
-        # Max single-day spike
-        max_spike = (volume_30d / avg_volume_90d).max() if avg_volume_90d > 0 else None
+        # Make filing dates timezone-aware for comparison
+        if filing_dts.tz is None:
+            filing_dts = filing_dts.tz_localize(NY_TZ)
 
-        # High volume days (>1.5x baseline)
-        high_vol_threshold = avg_volume_90d * 1.5
-        high_volume_days = (volume_30d > high_vol_threshold).sum()
+        # Need data: 90 days before filing for baseline, plus 1 year for percentile
+        window_starts = filing_dts - timedelta(days=400)  # Buffer for trading days
 
-        # Volume percentile (vs 1-year history)
-        if len(hist) > 60:
-            volume_percentile = stats.percentileofscore(hist['Volume'].tail(252), avg_volume_30d)
-        else:
-            volume_percentile = None
+        # One history read covers every filing of this ticker
+        hist = get_volume_history(ticker, window_starts.min(), filing_dts.max())
 
-        # Recent acceleration (last 10 days vs previous 20 days)
-        if len(volume_30d) >= 30:
-            recent_10d = volume_30d.tail(10).mean()
-            previous_20d = volume_30d.head(20).mean()
-            acceleration_ratio = recent_10d / previous_20d if previous_20d > 0 else None
-        else:
-            acceleration_ratio = None
-
-        return {
-            'avg_volume_30d_before': float(avg_volume_30d),
-            'avg_volume_90d_baseline': float(avg_volume_90d),
-            'abnormal_volume_ratio': float(abnormal_ratio) if abnormal_ratio else None,
-            'volume_trend_30d_pct': float(trend_pct) if trend_pct is not None else None,
-            'max_spike_ratio': float(max_spike) if max_spike else None,
-            'high_volume_days': int(high_volume_days),
-            'volume_percentile': float(volume_percentile) if volume_percentile else None,
-            'acceleration_ratio': float(acceleration_ratio) if acceleration_ratio else None,
-        }
+        if hist.empty or 'Volume' not in hist.columns:
+            return [EMPTY_VOLUME_METRICS] * len(filing_dts)
+
+        vol = hist['Volume'].to_numpy(dtype=np.float64)
+        starts = hist.index.searchsorted(window_starts, side='left')
+        ends = hist.index.searchsorted(filing_dts, side='left')
+
+        metrics = compute_volume_metrics_batch(vol, starts, ends)
+
+        results = []
+        for values in metrics:
+            if np.isnan(values[0]):
+                results.append(EMPTY_VOLUME_METRICS)
+                continue
+            result = {
+                field: (None if np.isnan(value) else value.item())
+                for field, value in zip(VOLUME_FIELDS, values)
+            }
+            result['high_volume_days'] = int(values[5])
+            results.append(result)
+        return results
 
     except Exception as e:
         print(f"  ❌ Error: {e}", file=sys.stderr)
-        return None
+        return [EMPTY_VOLUME_METRICS] * len(filing_dates)
 
 def load_cache():
     """Load cached volume data."""
     try:
-        with open(CACHE_FILE, 'r') as f:
-            return json.load(f)
+        with open(CACHE_FILE, 'rb') as f:
+            return orjson.loads(f.read())
     except FileNotFoundError:
         return {}
 
-def save_cache(cache):
-    """Save volume data cache."""
-    with open(CACHE_FILE, 'w') as f:
-        json.dump(cache, f, indent=2)
+def save_cache(cache, pretty=False):
+    """Save volume data cache (compact by default, indented with --pretty)."""
+    option = orjson.OPT_SERIALIZE_NUMPY
+    if pretty:
+        option |= orjson.OPT_INDENT_2
+    with open(CACHE_FILE, 'wb') as f:
+        f.write(orjson.dumps(cache, option=option))
 
 # ============================================================
 # ANALYSIS
 # ============================================================
 
-def analyze_prefiling_volume(csv_file):
+def analyze_prefiling_volume(csv_file, pretty_cache=False):
     """Main analysis pipeline."""
     print("="*80)
     print("  PRE-FILING VOLUME ANALYSIS (EXPERIMENTAL)")
@@ -177,87 +287,72 @@ def analyze_prefiling_volume(csv_file):
     print("📈 Fetching pre-filing volume data from yfinance...")
     print("   (This may take several minutes due to rate limiting...)\n")
 
-    volume_data = []
     fetched = 0
-    cached = 0
     failed = 0
-    
-    # Identify records that need fetching
-    records_to_fetch = []
-    for idx, row in df.iterrows():
-        ticker = row['ticker']
-        filing_date = row['filingDate']
-        cache_key = f"{ticker}_{filing_date.strftime('%Y-%m-%d')}"
-        
-        if cache_key not in cache:
-            records_to_fetch.append((idx, row, cache_key))
-
-    # Batch fetch for uncached records
-    for idx, row, cache_key in records_to_fetch:
-        ticker = row['ticker']
-        filing_date = row['filingDate']
-        
-        print(f"  [{idx+1}/{len(df)}] {ticker} on {filing_date.date()}", end=' ')
-        volume_metrics = fetch_prefiling_volume(ticker, filing_date)
-
-        if volume_metrics:
-            cache[cache_key] = volume_metrics
-            fetched += 1
-            print("✅")
-        else:
-            failed += 1
-            print("❌")
 
-        # Rate limiting
-        time.sleep(RATE_LIMIT_DELAY)
+    # Build cache keys in one vectorized pass (no per-row strftime)
+    cache_keys = (df['ticker'] + '_' + df['filingDate'].dt.strftime('%Y-%m-%d')).to_numpy()
 
-    # Process all records (cached + newly fetched)
-    for idx, row in df.iterrows():
-        ticker = row['ticker']
-        filing_date = row['filingDate']
-        filing_id = row['filingId']
-        cache_key = f"{ticker}_{filing_date.strftime('%Y-%m-%d')}"
-
-        # Check cache
-        if cache_key in cache:
-            volume_metrics = cache[cache_key]
-            if idx < len(records_to_fetch):
-                cached += 1
-                print(f"  [{idx+1}/{len(df)}] {ticker} on {filing_date.date()} - 💾 cached")
-        else:
-            volume_metrics = None
-
-        # Add to results
-        if volume_metrics:
-            volume_data.append({
-                'filingId': filing_id,
-                'ticker': ticker,
-                'filingDate': filing_date,
-                'actual7dReturn': row['actual7dReturn'],
-                'epsSurprise': row.get('epsSurprise'),
-                'return_positive': row['actual7dReturn'] > 0,
-                'beat': row.get('epsSurprise', 0) > 2,
-                'miss': row.get('epsSurprise', 0) < -2,
-                **volume_metrics
-            })
+    # Identify records that need fetching
+    records_to_fetch = [idx for idx, cache_key in enumerate(cache_keys) if cache_key not in cache]
+    cached = len(df) - len(records_to_fetch)
+
+    # Batch fetch for uncached records: one history read per ticker
+    pending = np.asarray(records_to_fetch, dtype=np.int64)
+    for ticker, positions in pd.Series(pending).groupby(df['ticker'].to_numpy()[pending], sort=False):
+        positions = positions.to_numpy()
+        filing_dates = df['filingDate'].to_numpy()[positions]
+        results = fetch_prefiling_volume_batch(ticker, filing_dates)
+
+        for idx, filing_date, volume_metrics in zip(positions, df['filingDate'].iloc[positions], results):
+            print(f"  [{idx+1}/{len(df)}] {ticker} on {filing_date.date()}", end=' ')
+            if volume_metrics['avg_volume_30d_before'] is not None:
+                cache[cache_keys[idx]] = volume_metrics
+                fetched += 1
+                print("✅")
+            else:
+                failed += 1
+                print("❌")
+
+    # Process all records (cached + newly fetched): collect metric tuples keyed
+    # by filingId, then join them back onto the filing columns in one merge
+    metric_rows = []
+    for filing_id, cache_key in zip(df['filingId'].to_numpy(), cache_keys):
+        volume_metrics = cache.get(cache_key, EMPTY_VOLUME_METRICS)
+        if volume_metrics['avg_volume_30d_before'] is not None:
+            metric_rows.append((filing_id, *(volume_metrics[field] for field in VOLUME_FIELDS)))
 
     # Save cache
-    save_cache(cache)
+    save_cache(cache, pretty=pretty_cache)
     print(f"\n💾 Saved {len(cache)} records to cache")
     print(f"📊 Fetched: {fetched} new | Cached: {cached} | Failed: {failed}\n")
 
-    if not volume_data:
+    if not metric_rows:
         print("❌ No volume data available. Cannot perform analysis.")
         return
 
-    # Create analysis dataframe
-    vol_df = pd.DataFrame(volume_data)
+    # Create analysis dataframe (surprise flags computed column-wise, not per row)
+    if 'epsSurprise' not in df.columns:
+        df['epsSurprise'] = np.nan
+    eps_surprise = df['epsSurprise'].fillna(0)
+    df['return_positive'] = df['actual7dReturn'] > 0
+    df['beat'] = eps_surprise > 2
+    df['miss'] = eps_surprise < -2
+
+    metrics_df = pd.DataFrame(metric_rows, columns=('filingId',) + VOLUME_FIELDS)
+    vol_df = df[[
+        'filingId', 'ticker', 'filingDate', 'actual7dReturn', 'epsSurprise',
+        'return_positive', 'beat', 'miss',
+    ]].merge(metrics_df, on='filingId', how='inner')
     coverage_pct = len(vol_df) / len(df) * 100
     print(f"✅ Volume data for {len(vol_df)}/{len(df)} samples ({coverage_pct:.1f}%)\n")
 
-    # Save raw data
+    # Save raw data: CSV for merge-volume-features.ts, plus Parquet (keeps
+    # dtypes, loads much faster) for the Python trainers
     vol_df.to_csv('prefiling-volume-data.csv', index=False)
-    print("💾 Saved to: prefiling-volume-data.csv\n")
+    print("💾 Saved to: prefiling-volume-data.csv")
+    vol_df.to_parquet('prefiling-volume-data.parquet', engine='pyarrow', compression='zstd', index=False)
+    print("💾 Saved to: prefiling-volume-data.parquet\n")
 
     # ============================================================
     # CORRELATION ANALYSIS
@@ -431,26 +526,26 @@ def analyze_prefiling_volume(csv_file):
     print("\n🔍 Looking for suspicious pre-filing volume patterns...\n")
 
     # Define suspicious patterns
-    vol_df['suspicious'] = (
+    suspicious = (
         (vol_df['abnormal_volume_ratio'] > 1.5) &  # High volume
         (vol_df['volume_trend_30d_pct'] > 15) &    # Rising
         (vol_df['acceleration_ratio'] > 1.3)       # Accelerating
     )
+    n_suspicious = int(suspicious.sum())
 
-    suspicious = vol_df[vol_df['suspicious']]
-
-    print(f"Found {len(suspicious)} potentially suspicious patterns\n")
+    print(f"Found {n_suspicious} potentially suspicious patterns\n")
 
-    if len(suspicious) > 0:
+    if n_suspicious > 0:
         print(f"{'Ticker':<10} {'Date':<12} {'Volume Ratio':<15} {'Trend %':<12} {'7d Return':<12}")
         print("-"*80)
 
-        for _, row in suspicious.head(20).iterrows():
+        for _, row in vol_df.loc[suspicious].nlargest(20, 'abnormal_volume_ratio').iterrows():
             print(f"{row['ticker']:<10} {str(row['filingDate'].date()):<12} {row['abnormal_volume_ratio']:>13.2f}x {row['volume_trend_30d_pct']:>10.1f}% {row['actual7dReturn']*100:>+10.2f}%")
 
-        # Check if suspicious patterns predict returns
-        suspicious_return = suspicious['actual7dReturn'].mean()
-        normal_return = vol_df[~vol_df['suspicious']]['actual7dReturn'].mean()
+        # Check if suspicious patterns predict returns (one grouped pass)
+        means = vol_df.groupby(suspicious)['actual7dReturn'].mean()
+        suspicious_return = means.get(True, np.nan)
+        normal_return = means.get(False, np.nan)
         diff = suspicious_return - normal_return
 
         print(f"\n💡 Suspicious patterns average return: {suspicious_return*100:+.2f}%")
@@ -509,9 +604,9 @@ def analyze_prefiling_volume(csv_file):
             reasons.append(f"👍 Some volume effect (+{vol_diff*100:.1f}%)")
 
     # Check suspicious patterns
-    if len(suspicious) > 5 and diff > 0.10:
+    if n_suspicious > 5 and diff > 0.10:
         score += 1
-        reasons.append(f"✅ Suspicious patterns detected ({len(suspicious)} cases)")
+        reasons.append(f"✅ Suspicious patterns detected ({n_suspicious} cases)")
 
     print("\n💡 Key Findings:\n")
     for reason in reasons:
@@ -546,7 +641,7 @@ def analyze_prefiling_volume(csv_file):
         'samples_analyzed': len(vol_df),
         'coverage_pct': float(coverage_pct),
         'correlations': {k: float(v) for k, v in correlations.items()},
-        'suspicious_patterns_found': int(len(suspicious)),
+        'suspicious_patterns_found': n_suspicious,
         'recommendation_score': score,
         'recommendation': 'STRONG' if score >= 4 else 'MODERATE' if score >= 2 else 'WEAK'
     }
@@ -556,8 +651,10 @@ def analyze_prefiling_volume(csv_file):
 
     print("\n✅ Results saved to:")
     print("   - prefiling-volume-data.csv")
+    print("   - prefiling-volume-data.parquet")
     print("   - prefiling-volume-summary.json")
     print("   - prefiling-volume-cache.json")
+    print(f"   - {VOLUME_STORE_DIR}/ (raw daily volume per ticker)")
 
     print("\n" + "="*80)
     print("✅ ANALYSIS COMPLETE")
@@ -565,9 +662,10 @@ def analyze_prefiling_volume(csv_file):
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python3 analyze-prefiling-volume.py <feature_csv>")
+        print("Usage: python3 analyze-prefiling-volume.py <feature_csv> [--pretty]")
         print("Example: python3 analyze-prefiling-volume.py model-features-initial.csv")
+        print("  --pretty   Write the volume cache as indented JSON (for humans)")
         sys.exit(1)
 
     csv_file = sys.argv[1]
-    analyze_prefiling_volume(csv_file)
\ No newline at end of file
+    analyze_prefiling_volume(csv_file, pretty_cache='--pretty' in sys.argv[2:])
\ No newline at end of file
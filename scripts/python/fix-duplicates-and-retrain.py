@@ -10,10 +10,14 @@ import pandas as pd
 import numpy as np
 from sklearn.linear_model import LogisticRegression
 from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+from sklearn.pipeline import make_pipeline
+from itertools import islice
 import sys
 
-def fix_and_retrain(csv_file):
+# Slices share memory until written to, so filtered frames need no defensive .copy()
+pd.options.mode.copy_on_write = True
+
+def fix_and_retrain(csv_file, write_csv=False):
     """Fix duplicates and retrain model."""
     print("="*80)
     print("  FIX DUPLICATES AND RETRAIN MODEL")
@@ -21,8 +25,8 @@ def fix_and_retrain(csv_file):
 
     # Load data
     print(f"\n📊 Loading data from {csv_file}...")
-    df = pd.read_csv(csv_file)
-    df['filingDate'] = pd.to_datetime(df['filingDate'])
+    # All columns are kept (the cleaned CSV is the input to later training scripts)
+    df = pd.read_csv(csv_file, parse_dates=['filingDate'], engine='pyarrow')
     df = df.sort_values('filingDate')
 
     print(f"  ✅ Loaded {len(df)} samples\n")
@@ -35,27 +39,27 @@ def fix_and_retrain(csv_file):
     print("STEP 1: IDENTIFY AND HANDLE DUPLICATES")
     print("="*80)
 
-    # Check for duplicates
-    df['ticker_date'] = df['ticker'] + '_' + df['filingDate'].dt.strftime('%Y-%m-%d')
-    duplicates = df[df.duplicated('ticker_date', keep=False)]
+    # Check for duplicates (hashes the ticker/date columns directly, no composite string key)
+    key_cols = ['ticker', 'filingDate']
+    duplicates = df[df.duplicated(key_cols, keep=False)]
+    n_dup_keys = len(duplicates.drop_duplicates(key_cols))
 
     print(f"\n🔍 Found {len(duplicates)} duplicate entries")
-    print(f"   Unique ticker/date combos with dups: {duplicates['ticker_date'].nunique()}")
+    print(f"   Unique ticker/date combos with dups: {n_dup_keys}")
 
     # Show examples
     print(f"\n📊 Example Duplicates:")
-    for ticker_date in duplicates['ticker_date'].unique()[:5]:
-        subset = df[df['ticker_date'] == ticker_date]
-        print(f"\n   {ticker_date}:")
-        for _, row in subset.iterrows():
-            print(f"      Filing: {row.get('filingId', 'N/A')[:20]}... | Return: {row['actual7dReturn']*100:+.1f}% | Surprise: {row['epsSurprise']:+.1f}%")
+    for (ticker, filing_date), subset in islice(duplicates.groupby(key_cols, sort=False), 5):
+        print(f"\n   {ticker}_{filing_date:%Y-%m-%d}:")
+        for row in subset.itertuples(index=False):
+            print(f"      Filing: {getattr(row, 'filingId', 'N/A')[:20]}... | Return: {row.actual7dReturn*100:+.1f}% | Surprise: {row.epsSurprise:+.1f}%")
 
     # Strategy: Keep one per ticker/date (the first one chronologically)
     print(f"\n💡 Deduplication Strategy:")
     print(f"   Keep first filing per ticker/date")
-    print(f"   Remove {len(duplicates) - duplicates['ticker_date'].nunique()} duplicate rows")
+    print(f"   Remove {len(duplicates) - n_dup_keys} duplicate rows")
 
-    df_dedup = df.drop_duplicates('ticker_date', keep='first').copy()
+    df_dedup = df.drop_duplicates(key_cols, keep='first')
 
     print(f"\n✅ After deduplication: {len(df_dedup)} samples ({len(df) - len(df_dedup)} removed)")
 
@@ -67,11 +71,9 @@ def fix_and_retrain(csv_file):
     print("STEP 2: REMOVE EXTREME OUTLIERS")
     print("="*80)
 
-    # Remove extreme outliers (>100% or <-100%)
-    df_no_extremes = df_dedup[
-        (df_dedup['actual7dReturn'] > -1.0) &
-        (df_dedup['actual7dReturn'] < 10.0)
-    ].copy()
+    # Remove extreme outliers (>100% or <-100%); boolean .loc already returns a new frame
+    ret = df_dedup['actual7dReturn'].to_numpy()
+    df_no_extremes = df_dedup.loc[(ret > -1.0) & (ret < 10.0)]
 
     removed_extremes = len(df_dedup) - len(df_no_extremes)
 
@@ -87,25 +89,24 @@ def fix_and_retrain(csv_file):
     print("STEP 3: WINSORIZE REMAINING OUTLIERS")
     print("="*80)
 
-    df_clean = df_no_extremes.copy()
-
-    # Winsorize at 1st and 99th percentile
-    lower_bound = df_clean['actual7dReturn'].quantile(0.01)
-    upper_bound = df_clean['actual7dReturn'].quantile(0.99)
+    # Winsorize at 1st and 99th percentile (both bounds from one partition pass;
+    # NaNs were already dropped by the extreme-outlier filter)
+    returns = df_no_extremes['actual7dReturn'].to_numpy()
+    lower_bound, upper_bound = np.quantile(returns, [0.01, 0.99])
 
     print(f"\n📊 Winsorization bounds:")
     print(f"   Lower (1st percentile): {lower_bound*100:.2f}%")
     print(f"   Upper (99th percentile): {upper_bound*100:.2f}%")
 
     # Count how many will be winsorized
-    n_lower = (df_clean['actual7dReturn'] < lower_bound).sum()
-    n_upper = (df_clean['actual7dReturn'] > upper_bound).sum()
+    n_lower = np.count_nonzero(returns < lower_bound)
+    n_upper = np.count_nonzero(returns > upper_bound)
 
     print(f"\n   Capping {n_upper} high values")
     print(f"   Flooring {n_lower} low values")
 
-    # Apply winsorization
-    df_clean['actual7dReturn'] = df_clean['actual7dReturn'].clip(lower=lower_bound, upper=upper_bound)
+    # Apply winsorization (assign builds the cleaned frame without a separate pre-copy)
+    df_clean = df_no_extremes.assign(actual7dReturn=np.clip(returns, lower_bound, upper_bound))
 
     # ============================================================
     # STEP 4: RETRAIN MODEL
@@ -130,13 +131,14 @@ def fix_and_retrain(csv_file):
     # Filter to available features
     available_features = [f for f in features if f in df_clean.columns]
 
-    X = df_clean[available_features].fillna(0)
-    y = df_clean['target']
+    # One contiguous float32 matrix; the train/test split below is just views
+    X = np.ascontiguousarray(df_clean[available_features].to_numpy(dtype=np.float32, na_value=0.0))
+    y = df_clean['target'].to_numpy()
 
     # Split
     split_idx = int(len(df_clean) * 0.7)
-    X_train, X_test = X.iloc[:split_idx], X.iloc[split_idx:]
-    y_train, y_test = y.iloc[:split_idx], y.iloc[split_idx:]
+    X_train, X_test = X[:split_idx], X[split_idx:]
+    y_train, y_test = y[:split_idx], y[split_idx:]
 
     train_dates = df_clean.iloc[:split_idx]['filingDate']
     test_dates = df_clean.iloc[split_idx:]['filingDate']
@@ -145,13 +147,13 @@ def fix_and_retrain(csv_file):
     print(f"   Training:   {len(X_train)} samples ({train_dates.min().date()} to {train_dates.max().date()})")
     print(f"   Testing:    {len(X_test)} samples ({test_dates.min().date()} to {test_dates.max().date()})")
 
-    # Scale and train
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
-
-    model = LogisticRegression(random_state=42, max_iter=1000)
-    model.fit(X_train_scaled, y_train)
+    # Scale and train (one pipeline: scaler is fit_transform'd inside fit)
+    pipe = make_pipeline(
+        StandardScaler(),
+        LogisticRegression(solver='liblinear', random_state=42, max_iter=200, C=1.0),
+    )
+    pipe.fit(X_train, y_train)
+    model = pipe[-1]
 
     print(f"\n✅ Model trained successfully")
 
@@ -164,15 +166,17 @@ def fix_and_retrain(csv_file):
     print("="*80)
 
     # Predictions
-    y_pred = model.predict(X_test_scaled)
-    y_pred_proba = model.predict_proba(X_test_scaled)[:, 1]
-
-    # Basic metrics
-    accuracy = accuracy_score(y_test, y_pred)
-
-    # Confusion matrix
-    cm = confusion_matrix(y_test, y_pred)
-    tn, fp, fn, tp = cm.ravel()
+    y_pred = pipe.predict(X_test)
+    y_pred_proba = pipe.predict_proba(X_test)[:, 1]
+
+    # Confusion matrix and accuracy straight from the binary label arrays
+    yt = y_test.astype(bool)
+    yp = y_pred.astype(bool)
+    tp = np.count_nonzero(yp & yt)
+    fp = np.count_nonzero(yp & ~yt)
+    fn = np.count_nonzero(~yp & yt)
+    tn = yp.size - tp - fp - fn
+    accuracy = (tp + tn) / yp.size
 
     print(f"\n📊 Classification Metrics:")
     print(f"   Accuracy:  {accuracy:.1%}")
@@ -185,11 +189,10 @@ def fix_and_retrain(csv_file):
     print(f"   True Positive:   {fn:>17}    {tp:>17}")
 
     # Return analysis
-    test_df = df_clean.iloc[split_idx:].copy()
-    test_df['prediction'] = y_pred
+    test_df = df_clean.iloc[split_idx:]
 
-    pred_pos = test_df[test_df['prediction'] == 1]
-    pred_neg = test_df[test_df['prediction'] == 0]
+    pred_pos = test_df[y_pred == 1]
+    pred_neg = test_df[y_pred == 0]
 
     avg_return_pos = pred_pos['actual7dReturn'].mean()
     avg_return_neg = pred_neg['actual7dReturn'].mean()
@@ -201,14 +204,12 @@ def fix_and_retrain(csv_file):
     print(f"   Return Spread:      {spread*100:+.2f} pts")
 
     # Feature importance
-    feature_importance = pd.DataFrame({
-        'feature': available_features,
-        'coefficient': model.coef_[0]
-    }).sort_values('coefficient', key=abs, ascending=False)
+    coefs = model.coef_[0]
+    order = np.argsort(-np.abs(coefs), kind='stable')
 
     print(f"\n📊 Feature Importance:")
-    for _, row in feature_importance.iterrows():
-        print(f"   {row['feature']:<20} {row['coefficient']:>+8.3f}")
+    for i in order:
+        print(f"   {available_features[i]:<20} {coefs[i]:>+8.3f}")
 
     # ============================================================
     # COMPARISON TO ORIGINAL
@@ -238,10 +239,13 @@ def fix_and_retrain(csv_file):
     # SAVE RESULTS
     # ============================================================
 
-    df_clean.to_csv('model-features-final-clean.csv', index=False)
+    df_clean.to_parquet('model-features-final-clean.parquet', engine='pyarrow', compression='zstd', index=False)
 
     print(f"\n✅ Saved cleaned dataset:")
-    print(f"   - model-features-final-clean.csv ({len(df_clean)} samples)")
+    print(f"   - model-features-final-clean.parquet ({len(df_clean)} samples)")
+    if write_csv:
+        df_clean.to_csv('model-features-final-clean.csv', index=False)
+        print(f"   - model-features-final-clean.csv ({len(df_clean)} samples)")
 
     # ============================================================
     # FINAL VERDICT
@@ -274,9 +278,10 @@ def fix_and_retrain(csv_file):
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python3 fix-duplicates-and-retrain.py <csv_file>")
+        print("Usage: python3 fix-duplicates-and-retrain.py <csv_file> [--csv]")
         print("Example: python3 fix-duplicates-and-retrain.py model-features-full.csv")
+        print("  --csv  Also write model-features-final-clean.csv")
         sys.exit(1)
 
     csv_file = sys.argv[1]
-    fix_and_retrain(csv_file)
+    fix_and_retrain(csv_file, write_csv='--csv' in sys.argv[2:])
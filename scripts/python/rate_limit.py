@@ -0,0 +1,26 @@
+"""
+Shared request throttle for the data-collection scripts
+
+Imported by scripts/python/test-short-squeeze.py and scripts/test-collection.py.
+"""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """Minimum spacing between request starts, shared by every thread using it."""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval  # Seconds between request starts
+        self._lock = threading.Lock()
+        self._next_request_at = 0.0
+
+    def wait(self):
+        """Block until this thread may start a request."""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + self.min_interval
+        if wait > 0:
+            time.sleep(wait)
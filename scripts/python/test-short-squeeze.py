@@ -7,26 +7,43 @@ Tests if high short interest + earnings beat = bigger returns (short squeeze)
 Uses current short interest data from Yahoo Finance matched to recent filings.
 """
 
+import json
+import numpy as np
 import pandas as pd
 import yfinance as yf
-import time
 import sys
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+from rate_limit import RateLimiter
+
+# Slices share memory until written to, so filtered frames need no defensive .copy()
+pd.options.mode.copy_on_write = True
 
 # ============================================================
 # CONFIGURATION
 # ============================================================
 
 SHORT_INTEREST_THRESHOLD = 10.0  # >10% is "high" short interest
-RATE_LIMIT_DELAY = 0.5  # Seconds between API calls
+EPS_CATEGORIES = pd.CategoricalDtype(['Beat', 'Miss', 'Inline'])
+RATE_LIMIT_DELAY = 0.5  # Min seconds between API call starts (shared across threads)
+MAX_WORKERS = 8  # Concurrent Yahoo Finance requests
+# Only these columns are read from the feature CSV
+FEATURE_COLUMNS = ['ticker', 'filingDate', 'actual7dReturn', 'epsSurprise']
+FEATURE_DTYPES = {'ticker': 'category', 'actual7dReturn': 'float32', 'epsSurprise': 'float32'}
+SI_CACHE_FILE = 'short-interest-cache.json'  # "TICKER_YYYY-MM-DD" -> fetch result, reused for that day
 
 # ============================================================
 # DATA FETCHING
 # ============================================================
 
+# Spaces out Yahoo Finance calls across all worker threads
+_throttle = RateLimiter(RATE_LIMIT_DELAY)
+
 def get_short_interest(ticker):
     """Fetch current short interest for a ticker."""
     try:
+        _throttle.wait()
         stock = yf.Ticker(ticker)
         info = stock.info
 
@@ -52,6 +69,69 @@ def get_short_interest(ticker):
             'error': str(e)
         }
 
+def si_cache_key(ticker):
+    """Cache key for today's short interest (SI only changes daily at most)."""
+    return f"{ticker}_{date.today().isoformat()}"
+
+def load_si_cache():
+    """Load today's cached short interest data (older days are dropped)."""
+    try:
+        with open(SI_CACHE_FILE) as f:
+            cache = json.load(f)
+    except FileNotFoundError:
+        return {}
+    suffix = f"_{date.today().isoformat()}"
+    return {k: v for k, v in cache.items() if k.endswith(suffix)}
+
+def save_si_cache(cache):
+    """Save short interest cache."""
+    with open(SI_CACHE_FILE, 'w') as f:
+        json.dump(cache, f)
+
+def get_short_interest_cached(ticker, cache):
+    """Return today's cached short interest for a ticker, fetching on a miss."""
+    cached = cache.get(si_cache_key(ticker))
+    if cached is not None:
+        return cached
+    return get_short_interest(ticker)
+
+# ============================================================
+# GROUP STATISTICS
+# ============================================================
+
+def group_return_stats(returns, codes, n_groups):
+    """
+    Per-group return statistics from one sort of the returns.
+
+    `codes` holds a group id in [0, n_groups) per row (negative ids are
+    skipped, as are NaN returns). Returns an (n_groups, 5) array of
+    count, mean, median, max and % positive; empty groups have count 0
+    and NaN stats.
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    codes = np.asarray(codes, dtype=np.intp)
+    valid = (codes >= 0) & ~np.isnan(returns)
+    returns, codes = returns[valid], codes[valid]
+
+    # Sort by group, then by return: each group is a contiguous sorted run
+    order = np.lexsort((returns, codes))
+    sorted_returns = returns[order]
+
+    counts = np.bincount(codes, minlength=n_groups)
+    sums = np.bincount(codes, weights=returns, minlength=n_groups)
+    positives = np.bincount(codes, weights=returns > 0, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+
+    stats = np.full((n_groups, 5), np.nan)
+    stats[:, 0] = counts
+    has = counts > 0
+    n, first = counts[has], starts[has]
+    stats[has, 1] = sums[has] / n
+    stats[has, 2] = (sorted_returns[first + (n - 1) // 2] + sorted_returns[first + n // 2]) / 2
+    stats[has, 3] = sorted_returns[first + n - 1]
+    stats[has, 4] = positives[has] / n * 100
+    return stats
+
 # ============================================================
 # ANALYSIS
 # ============================================================
@@ -66,12 +146,14 @@ def analyze_short_squeeze(csv_file):
 
     # Load feature data
     print(f"📊 Loading feature data from {csv_file}...")
-    df = pd.read_csv(csv_file)
-    df['filingDate'] = pd.to_datetime(df['filingDate'])
+    df = pd.read_csv(csv_file, usecols=FEATURE_COLUMNS, dtype=FEATURE_DTYPES,
+                     parse_dates=['filingDate'], engine='pyarrow')
 
-    # Filter to recent filings (last 3 months) where current SI is most relevant
-    cutoff_date = datetime.now() - timedelta(days=90)
-    recent_df = df[df['filingDate'] >= cutoff_date].copy()
+    # Filter to recent filings (last 3 months) where current SI is most relevant;
+    # once sorted by date that is a binary search plus a tail slice
+    df = df.sort_values('filingDate', ignore_index=True)
+    cutoff_date = pd.Timestamp(datetime.now() - timedelta(days=90))
+    recent_df = df.iloc[df['filingDate'].searchsorted(cutoff_date, side='left'):]
 
     print(f"  ✅ Loaded {len(df)} total samples")
     print(f"  ✅ Using {len(recent_df)} recent samples (last 90 days)\n")
@@ -85,31 +167,38 @@ def analyze_short_squeeze(csv_file):
     print(f"📊 Fetching short interest for {len(tickers)} tickers...")
     print("   (This will take a few minutes...)\n")
 
-    # Fetch short interest
+    # Fetch short interest: requests are I/O-bound, so overlap them across
+    # threads while _throttle.wait() keeps the overall request rate capped.
+    # Today's results are cached on disk, so re-runs skip the network.
+    si_cache = load_si_cache()
     short_data = []
-    for i, ticker in enumerate(tickers, 1):
-        print(f"  [{i}/{len(tickers)}] {ticker}...", end=' ')
-        si_data = get_short_interest(ticker)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        fetched = executor.map(lambda t: get_short_interest_cached(t, si_cache), tickers)
+        for i, si_data in enumerate(fetched, 1):
+            print(f"  [{i}/{len(tickers)}] {si_data['ticker']}...", end=' ')
 
-        if si_data['success'] and si_data['short_pct_float'] is not None:
-            short_data.append(si_data)
-            print(f"✅ {si_data['short_pct_float']*100:.1f}%")
-        else:
-            print("❌")
+            if si_data['success']:
+                si_cache[si_cache_key(si_data['ticker'])] = si_data
 
-        time.sleep(RATE_LIMIT_DELAY)
+            if si_data['success'] and si_data['short_pct_float'] is not None:
+                short_data.append(si_data)
+                print(f"✅ {si_data['short_pct_float']*100:.1f}%")
+            else:
+                print("❌")
+
+    save_si_cache(si_cache)
 
     print(f"\n✅ Got short interest for {len(short_data)}/{len(tickers)} tickers\n")
 
-    # Create short interest lookup
+    # Add short interest to filings (hash join on ticker, no Python dict)
     si_df = pd.DataFrame(short_data)
-    si_lookup = si_df.set_index('ticker')['short_pct_float'].to_dict()
-
-    # Add short interest to filings
-    recent_df['short_interest'] = recent_df['ticker'].map(si_lookup)
+    recent_df = recent_df.merge(
+        si_df[['ticker', 'short_pct_float']].rename(columns={'short_pct_float': 'short_interest'}),
+        on='ticker', how='left'
+    )
 
     # Filter to filings with SI data
-    with_si = recent_df[recent_df['short_interest'].notna()].copy()
+    with_si = recent_df[recent_df['short_interest'].notna()]
     coverage = len(with_si) / len(recent_df) * 100
 
     print(f"📊 Coverage: {len(with_si)}/{len(recent_df)} filings ({coverage:.1f}%) have short interest data\n")
@@ -118,11 +207,15 @@ def analyze_short_squeeze(csv_file):
         print("❌ No filings with short interest data")
         return
 
-    # Categorize by short interest and earnings surprise
-    with_si['high_short_interest'] = with_si['short_interest'] > (SHORT_INTEREST_THRESHOLD / 100)
-    with_si['beat'] = with_si['epsSurprise'] > 2
-    with_si['miss'] = with_si['epsSurprise'] < -2
-    with_si['inline'] = (~with_si['beat']) & (~with_si['miss'])
+    # Categorize by short interest and earnings surprise (one pass over the
+    # surprise column into Beat=0 / Miss=1 / Inline=2 codes)
+    eps = with_si['epsSurprise'].to_numpy()
+    eps_codes = np.where(eps > 2, 0, np.where(eps < -2, 1, 2)).astype(np.int8)
+    with_si = with_si.assign(
+        high_short_interest=with_si['short_interest'] > (SHORT_INTEREST_THRESHOLD / 100),
+        eps_cat=pd.Categorical.from_codes(eps_codes, dtype=EPS_CATEGORIES),
+    )
+    is_beat = (with_si['eps_cat'] == 'Beat').to_numpy()
 
     # ============================================================
     # SHORT INTEREST DISTRIBUTION
@@ -148,8 +241,8 @@ def analyze_short_squeeze(csv_file):
     top_shorted = with_si.nlargest(10, 'short_interest')[['ticker', 'short_interest', 'filingDate', 'epsSurprise', 'actual7dReturn']]
     print(f"\n{'Ticker':<8} {'Short %':<10} {'Date':<12} {'EPS Surprise':<15} {'7d Return':<12}")
     print("-"*80)
-    for _, row in top_shorted.iterrows():
-        print(f"{row['ticker']:<8} {row['short_interest']*100:<10.1f} {str(row['filingDate'].date()):<12} {row['epsSurprise']:<+15.1f} {row['actual7dReturn']*100:<+12.1f}%")
+    for ticker, short_interest, filing_date, eps_surprise, ret in top_shorted.itertuples(index=False, name=None):
+        print(f"{ticker:<8} {short_interest*100:<10.1f} {str(filing_date.date()):<12} {eps_surprise:<+15.1f} {ret*100:<+12.1f}%")
 
     # ============================================================
     # SHORT SQUEEZE ANALYSIS
@@ -161,38 +254,41 @@ def analyze_short_squeeze(csv_file):
 
     print("\n📊 Returns by Short Interest + Earnings Result:\n")
 
+    # label -> (high_short_interest, eps_cat), in display order
     scenarios = [
-        ("High SI + Beat", with_si['high_short_interest'] & with_si['beat']),
-        ("Normal SI + Beat", (~with_si['high_short_interest']) & with_si['beat']),
-        ("High SI + Miss", with_si['high_short_interest'] & with_si['miss']),
-        ("Normal SI + Miss", (~with_si['high_short_interest']) & with_si['miss']),
-        ("High SI + Inline", with_si['high_short_interest'] & with_si['inline']),
-        ("Normal SI + Inline", (~with_si['high_short_interest']) & with_si['inline']),
+        ("High SI + Beat", (True, 'Beat')),
+        ("Normal SI + Beat", (False, 'Beat')),
+        ("High SI + Miss", (True, 'Miss')),
+        ("Normal SI + Miss", (False, 'Miss')),
+        ("High SI + Inline", (True, 'Inline')),
+        ("Normal SI + Inline", (False, 'Inline')),
     ]
 
+    # All scenario stats from one pass: group id = high_si * 3 + eps code
+    n_eps = len(EPS_CATEGORIES.categories)
+    scenario_codes = with_si['high_short_interest'].to_numpy() * n_eps + eps_codes
+    scenario_stats = group_return_stats(with_si['actual7dReturn'].to_numpy(), scenario_codes, 2 * n_eps)
+
     print(f"{'Scenario':<25} {'Count':<8} {'Avg Return':<15} {'Median Return':<15} {'% Positive':<12}")
     print("-"*80)
 
     results = []
 
-    for name, mask in scenarios:
-        subset = with_si[mask]
-        if len(subset) == 0:
+    for name, (high_si, cat) in scenarios:
+        count, avg_return, median_return, _, pct_positive = scenario_stats[high_si * n_eps + EPS_CATEGORIES.categories.get_loc(cat)]
+        count = int(count)
+        if count == 0:
             continue
 
-        avg_return = subset['actual7dReturn'].mean()
-        median_return = subset['actual7dReturn'].median()
-        pct_positive = (subset['actual7dReturn'] > 0).sum() / len(subset) * 100
-
         results.append({
             'scenario': name,
-            'count': len(subset),
+            'count': count,
             'avg_return': avg_return,
             'median_return': median_return,
             'pct_positive': pct_positive
         })
 
-        print(f"{name:<25} {len(subset):<8} {avg_return*100:<+15.2f}% {median_return*100:<+15.2f}% {pct_positive:<12.1f}%")
+        print(f"{name:<25} {count:<8} {avg_return*100:<+15.2f}% {median_return*100:<+15.2f}% {pct_positive:<12.1f}%")
 
     # ============================================================
     # SHORT SQUEEZE DETECTION
@@ -205,9 +301,9 @@ def analyze_short_squeeze(csv_file):
     # Define short squeeze: high SI + beat + big return
     squeeze_candidates = with_si[
         (with_si['high_short_interest']) &
-        (with_si['beat']) &
+        is_beat &
         (with_si['actual7dReturn'] > 0.10)  # >10% return
-    ].copy()
+    ]
 
     print(f"\n🎯 Detected {len(squeeze_candidates)} potential short squeezes")
     print("   (High SI + Beat + >10% return)\n")
@@ -217,9 +313,10 @@ def analyze_short_squeeze(csv_file):
         print(f"{'Ticker':<8} {'Short %':<10} {'Date':<12} {'Surprise':<12} {'Return':<12} {'Status'}")
         print("-"*80)
 
-        for _, row in squeeze_candidates.iterrows():
-            status = "🚀 SQUEEZE" if row['actual7dReturn'] > 0.30 else "📈 Strong"
-            print(f"{row['ticker']:<8} {row['short_interest']*100:<10.1f} {str(row['filingDate'].date()):<12} {row['epsSurprise']:<+12.1f} {row['actual7dReturn']*100:<+12.1f}% {status}")
+        rows = squeeze_candidates[['ticker', 'short_interest', 'filingDate', 'epsSurprise', 'actual7dReturn']]
+        for ticker, short_interest, filing_date, eps_surprise, ret in rows.itertuples(index=False, name=None):
+            status = "🚀 SQUEEZE" if ret > 0.30 else "📈 Strong"
+            print(f"{ticker:<8} {short_interest*100:<10.1f} {str(filing_date.date()):<12} {eps_surprise:<+12.1f} {ret*100:<+12.1f}% {status}")
 
     # ============================================================
     # STATISTICAL ANALYSIS
@@ -230,8 +327,8 @@ def analyze_short_squeeze(csv_file):
     print("="*80)
 
     # Compare high SI + beat vs normal SI + beat
-    high_si_beat = with_si[with_si['high_short_interest'] & with_si['beat']]['actual7dReturn']
-    normal_si_beat = with_si[(~with_si['high_short_interest']) & with_si['beat']]['actual7dReturn']
+    high_si_beat = with_si[with_si['high_short_interest'] & is_beat]['actual7dReturn']
+    normal_si_beat = with_si[(~with_si['high_short_interest']) & is_beat]['actual7dReturn']
 
     if len(high_si_beat) > 0 and len(normal_si_beat) > 0:
         diff = high_si_beat.mean() - normal_si_beat.mean()
@@ -258,29 +355,29 @@ def analyze_short_squeeze(csv_file):
     print("RETURNS BY SHORT INTEREST LEVEL (BEATS ONLY)")
     print("="*80)
 
-    beats_only = with_si[with_si['beat']].copy()
+    beats_only = with_si[is_beat]
 
     if len(beats_only) > 0:
         # Create buckets
-        beats_only['si_bucket'] = pd.cut(
+        beats_only = beats_only.assign(si_bucket=pd.cut(
             beats_only['short_interest'] * 100,
             bins=[0, 5, 10, 15, 20, 100],
             labels=['0-5%', '5-10%', '10-15%', '15-20%', '>20%']
-        )
+        ))
 
         print(f"\n{'SI Bucket':<15} {'Count':<8} {'Avg Return':<15} {'Median Return':<15} {'Max Return':<12}")
         print("-"*80)
 
-        for bucket in ['0-5%', '5-10%', '10-15%', '15-20%', '>20%']:
-            subset = beats_only[beats_only['si_bucket'] == bucket]
-            if len(subset) == 0:
-                continue
-
-            avg_return = subset['actual7dReturn'].mean()
-            median_return = subset['actual7dReturn'].median()
-            max_return = subset['actual7dReturn'].max()
+        # Bucket codes from pd.cut (-1 = outside all buckets) drive one stats pass
+        buckets = beats_only['si_bucket'].cat
+        bucket_stats = group_return_stats(
+            beats_only['actual7dReturn'].to_numpy(), buckets.codes.to_numpy(), len(buckets.categories)
+        )
 
-            print(f"{bucket:<15} {len(subset):<8} {avg_return*100:<+15.2f}% {median_return*100:<+15.2f}% {max_return*100:<+12.1f}%")
+        for bucket, (count, avg_return, median_return, max_return, _) in zip(buckets.categories, bucket_stats):
+            if count == 0:
+                continue
+            print(f"{bucket:<15} {int(count):<8} {avg_return*100:<+15.2f}% {median_return*100:<+15.2f}% {max_return*100:<+12.1f}%")
 
     # ============================================================
     # SAVE RESULTS
@@ -295,16 +392,15 @@ def analyze_short_squeeze(csv_file):
         'scenarios': results,
     }
 
-    import json
     with open('short-squeeze-analysis.json', 'w') as f:
         json.dump(output, f, indent=2)
 
     # Save detailed data
-    with_si.to_csv('short-interest-filings.csv', index=False)
+    with_si.to_parquet('short-interest-filings.parquet', engine='pyarrow', compression='zstd', index=False)
 
     print("\n✅ Results saved to:")
     print("   - short-squeeze-analysis.json")
-    print("   - short-interest-filings.csv")
+    print("   - short-interest-filings.parquet")
 
     # ============================================================
     # CONCLUSION
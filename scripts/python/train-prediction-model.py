@@ -6,16 +6,23 @@ Compares multiple approaches: baseline, enhanced, and ML models
 
 import pandas as pd
 import numpy as np
+import pyarrow.parquet as pq
 from sklearn.model_selection import TimeSeriesSplit, cross_val_score
 from sklearn.linear_model import LogisticRegression, Ridge
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
 from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix, roc_auc_score
+from sklearn.inspection import permutation_importance
+from sklearn.metrics import classification_report, roc_auc_score
 import warnings
 warnings.filterwarnings('ignore')
 
+import joblib
+from joblib import Parallel, delayed
+from contextlib import redirect_stdout
+import io
+import os
 import sys
-import json
+import orjson
 from datetime import datetime
 
 # ============================================================
@@ -24,6 +31,8 @@ from datetime import datetime
 
 RETURN_THRESHOLD = 0.0  # 0% - positive vs negative
 RANDOM_STATE = 42
+CV_SPLITS = 5  # Rolling-origin folds over the training window (model selection)
+MODEL_DIR = 'models'  # Fitted models are saved here as <slug>.joblib
 
 # Feature sets for different models
 BASELINE_FEATURES = [
@@ -47,6 +56,20 @@ FULL_FEATURES = ENHANCED_FEATURES + [
     'debtToAssets',
 ]
 
+# Compared models, keyed by the names used in results
+MODEL_FEATURES = {
+    'Baseline': BASELINE_FEATURES,
+    'Enhanced': ENHANCED_FEATURES,
+    'ML (GBM)': FULL_FEATURES,
+}
+
+# Saved model file names (under MODEL_DIR)
+MODEL_FILES = {
+    'Baseline': 'prediction_baseline.joblib',
+    'Enhanced': 'prediction_enhanced.joblib',
+    'ML (GBM)': 'prediction_ml.joblib',
+}
+
 # ============================================================
 # DATA LOADING
 # ============================================================
@@ -55,9 +78,17 @@ def load_data(csv_file):
     """Load and prepare data."""
     print(f"\n📊 Loading data from {csv_file}...")
 
-    df = pd.read_csv(csv_file)
-
-    # Convert date to datetime
+    if csv_file.endswith('.parquet'):
+        # Parquet keeps dtypes; only read the columns the models can use
+        wanted = ['filingDate', 'actual7dReturn', *FULL_FEATURES]
+        present = set(pq.read_schema(csv_file).names)
+        df = pd.read_parquet(csv_file, columns=[c for c in wanted if c in present])
+    else:
+        # Multithreaded Arrow parser; feature columns arrive as float32 already
+        df = pd.read_csv(csv_file, engine='pyarrow', parse_dates=['filingDate'],
+                         dtype={f: 'float32' for f in FULL_FEATURES})
+
+    # Convert date to datetime (no-op for parsed CSV dates)
     df['filingDate'] = pd.to_datetime(df['filingDate'])
 
     # Sort by date (chronological)
@@ -82,8 +113,8 @@ def time_series_split(df, train_pct=0.7):
     """Split data chronologically."""
     split_idx = int(len(df) * train_pct)
 
-    train_df = df.iloc[:split_idx].copy()
-    test_df = df.iloc[split_idx:].copy()
+    train_df = df.iloc[:split_idx]
+    test_df = df.iloc[split_idx:]
 
     print(f"\n📊 Train/Test Split:")
     print(f"  Training:   {len(train_df)} samples ({df['filingDate'].iloc[0]} to {train_df['filingDate'].iloc[-1]})")
@@ -95,25 +126,25 @@ def time_series_split(df, train_pct=0.7):
 # FEATURE PREPARATION
 # ============================================================
 
-def prepare_features(df, feature_list):
+def prepare_features(df, feature_list, verbose=True):
     """Prepare feature matrix and handle missing values."""
 
     # Filter to features that exist in dataframe
     available_features = [f for f in feature_list if f in df.columns]
     missing_features = [f for f in feature_list if f not in df.columns]
 
-    if missing_features:
+    if missing_features and verbose:
         print(f"  ⚠️  Missing features: {missing_features}")
 
-    X = df[available_features].copy()
-    y = df['target'].copy()
-
     # Handle missing values
     # For numeric features: fill with 0
     # For boolean features: fill with False (0)
-    X = X.fillna(0)
+    # (fillna/astype already return new frames, so no explicit copies)
+    X = df[available_features].fillna(0).astype(np.float32)
+    y = df['target'].astype(np.int32)
 
-    print(f"  ✅ Using {len(available_features)} features")
+    if verbose:
+        print(f"  ✅ Using {len(available_features)} features")
 
     return X, y, available_features
 
@@ -121,6 +152,37 @@ def prepare_features(df, feature_list):
 # MODEL TRAINING
 # ============================================================
 
+def make_model(model_name):
+    """Return an unfitted (model, scaler) pair for one of MODEL_FEATURES."""
+    if model_name == 'ML (GBM)':
+        # Histogram gradient boosting (bins features internally; no scaling needed)
+        model = HistGradientBoostingClassifier(
+            max_iter=100,
+            learning_rate=0.1,
+            max_depth=3,
+            random_state=RANDOM_STATE,
+            early_stopping=False
+        )
+        return model, None
+
+    # Logistic regression with L2 regularization
+    return LogisticRegression(random_state=RANDOM_STATE, solver='liblinear', max_iter=200, C=1.0), StandardScaler()
+
+def print_feature_importance(features, values, signed):
+    """Print a feature-importance table in one write.
+
+    signed=True: logistic coefficients, ranked by magnitude.
+    signed=False: importances above 0.01, ranked descending, with a bar.
+    """
+    fi = pd.DataFrame({'feature': features, 'imp': values})
+    if signed:
+        fi = fi.sort_values('imp', key=abs, ascending=False)
+        lines = [f"  {feat:20s} {imp:+.4f}" for feat, imp in fi.itertuples(index=False)]
+    else:
+        fi = fi[fi['imp'] > 0.01].sort_values('imp', ascending=False)  # Only show important features
+        lines = [f"  {feat:20s} {imp:.4f} {'█' * int(imp * 50)}" for feat, imp in fi.itertuples(index=False)]
+    print("\n📊 Feature Importance:\n" + '\n'.join(lines))
+
 def train_baseline_model(train_df):
     """Train baseline model: earnings surprise only."""
     print("\n" + "="*80)
@@ -130,16 +192,12 @@ def train_baseline_model(train_df):
     X_train, y_train, features = prepare_features(train_df, BASELINE_FEATURES)
 
     # Simple logistic regression
-    scaler = StandardScaler()
+    model, scaler = make_model('Baseline')
     X_train_scaled = scaler.fit_transform(X_train)
-
-    model = LogisticRegression(random_state=RANDOM_STATE, max_iter=1000)
     model.fit(X_train_scaled, y_train)
 
     # Feature importance
-    print("\n📊 Feature Importance:")
-    for feat, coef in sorted(zip(features, model.coef_[0]), key=lambda x: abs(x[1]), reverse=True):
-        print(f"  {feat:20s} {coef:+.4f}")
+    print_feature_importance(features, model.coef_[0], signed=True)
 
     return model, scaler, features
 
@@ -151,17 +209,12 @@ def train_enhanced_model(train_df):
 
     X_train, y_train, features = prepare_features(train_df, ENHANCED_FEATURES)
 
-    scaler = StandardScaler()
+    model, scaler = make_model('Enhanced')
     X_train_scaled = scaler.fit_transform(X_train)
-
-    # Logistic regression with L2 regularization
-    model = LogisticRegression(random_state=RANDOM_STATE, max_iter=1000, C=1.0)
     model.fit(X_train_scaled, y_train)
 
     # Feature importance
-    print("\n📊 Feature Importance:")
-    for feat, coef in sorted(zip(features, model.coef_[0]), key=lambda x: abs(x[1]), reverse=True):
-        print(f"  {feat:20s} {coef:+.4f}")
+    print_feature_importance(features, model.coef_[0], signed=True)
 
     return model, scaler, features
 
@@ -173,24 +226,84 @@ def train_ml_model(train_df):
 
     X_train, y_train, features = prepare_features(train_df, FULL_FEATURES)
 
-    # Gradient boosting (no scaling needed)
-    model = GradientBoostingClassifier(
-        n_estimators=100,
-        learning_rate=0.1,
-        max_depth=3,
-        random_state=RANDOM_STATE
-    )
+    model, _ = make_model('ML (GBM)')
     model.fit(X_train, y_train)
 
-    # Feature importance
-    print("\n📊 Feature Importance:")
-    for feat, imp in sorted(zip(features, model.feature_importances_), key=lambda x: x[1], reverse=True):
-        if imp > 0.01:  # Only show important features
-            bar = '█' * int(imp * 50)
-            print(f"  {feat:20s} {imp:.4f} {bar}")
+    # Feature importance (HGB has no impurity importances, so use permutation)
+    importances = permutation_importance(
+        model, X_train, y_train, n_repeats=5, n_jobs=-1, random_state=RANDOM_STATE
+    ).importances_mean
+    print_feature_importance(features, importances, signed=False)
 
     return model, None, features
 
+TRAINERS = {
+    'Baseline': train_baseline_model,
+    'Enhanced': train_enhanced_model,
+    'ML (GBM)': train_ml_model,
+}
+
+def train_one(model_name, train_df):
+    """Train one model in a worker, returning its console output alongside it."""
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        model, scaler, features = TRAINERS[model_name](train_df)
+    return model, scaler, features, buf.getvalue()
+
+# ============================================================
+# CROSS-VALIDATION
+# ============================================================
+
+def cross_validate_models(train_df):
+    """Rolling-origin CV over the training window; per-model mean/std AUC and accuracy."""
+    print("\n" + "="*80)
+    print(f"CROSS-VALIDATION ({CV_SPLITS}-fold rolling origin)")
+    print("="*80)
+
+    test_size = max(20, len(train_df) // 10)
+    if len(train_df) <= CV_SPLITS * test_size:
+        print(f"\n⚠️  Only {len(train_df)} training samples - too few for {CV_SPLITS} folds of {test_size}, skipping CV")
+        return {}
+
+    tscv = TimeSeriesSplit(n_splits=CV_SPLITS, test_size=test_size)
+    scores = {name: {'auc': [], 'accuracy': []} for name in MODEL_FEATURES}
+
+    for fit_idx, val_idx in tscv.split(train_df):
+        fit_df, val_df = train_df.iloc[fit_idx], train_df.iloc[val_idx]
+
+        for name, feature_list in MODEL_FEATURES.items():
+            X_fit, y_fit, features = prepare_features(fit_df, feature_list, verbose=False)
+            X_val, y_val, _ = prepare_features(val_df, features, verbose=False)
+
+            model, scaler = make_model(name)
+            if scaler:
+                X_fit = scaler.fit_transform(X_fit)
+                X_val = scaler.transform(X_val)
+            model.fit(X_fit, y_fit)
+
+            y_val = y_val.to_numpy()
+            scores[name]['accuracy'].append((model.predict(X_val) == y_val).mean())
+            if len(np.unique(y_val)) > 1:  # AUC undefined on single-class folds
+                scores[name]['auc'].append(roc_auc_score(y_val, model.predict_proba(X_val)[:, 1]))
+
+    summary = {}
+    print(f"\n{'Model':<12} {'AUC (mean ± std)':<20} {'Accuracy (mean ± std)':<24}")
+    print("-"*60)
+    for name, fold_scores in scores.items():
+        auc = np.array(fold_scores['auc'])
+        acc = np.array(fold_scores['accuracy'])
+        summary[name] = {
+            'auc_mean': float(auc.mean()) if auc.size else None,
+            'auc_std': float(auc.std()) if auc.size else None,
+            'accuracy_mean': float(acc.mean()),
+            'accuracy_std': float(acc.std()),
+            'folds': len(acc),
+        }
+        auc_str = f"{auc.mean():.3f} ± {auc.std():.3f}" if auc.size else "n/a"
+        print(f"{name:<12} {auc_str:<20} {acc.mean()*100:.1f}% ± {acc.std()*100:.1f}%")
+
+    return summary
+
 # ============================================================
 # EVALUATION
 # ============================================================
@@ -207,21 +320,23 @@ def evaluate_model(model, scaler, features, test_df, model_name):
     if scaler:
         X_test = scaler.transform(X_test)
 
-    # Predictions
-    y_pred = model.predict(X_test)
-    y_pred_proba = model.predict_proba(X_test)[:, 1]
+    # Predictions: one pass for the class-1 score; predicting class 1 is
+    # score > 0, and AUC only needs the ranking, not calibrated probabilities
+    scores = model.decision_function(X_test)
+    y_pred = (scores > 0).astype(np.int8)
 
-    # Metrics
-    accuracy = accuracy_score(y_test, y_pred)
+    # Metrics (binary labels: confusion cells from one bincount over 2*true + pred)
+    yt = y_test.to_numpy().astype(np.int8)
+    yp = y_pred
+    accuracy = (yt == yp).mean()
 
     try:
-        auc = roc_auc_score(y_test, y_pred_proba)
+        auc = roc_auc_score(y_test, scores)
     except:
         auc = None
 
     # Confusion matrix
-    cm = confusion_matrix(y_test, y_pred)
-    tn, fp, fn, tp = cm.ravel()
+    tn, fp, fn, tp = np.bincount(2 * yt + yp, minlength=4)
 
     precision = tp / (tp + fp) if (tp + fp) > 0 else 0
     recall = tp / (tp + fn) if (tp + fn) > 0 else 0
@@ -240,11 +355,11 @@ def evaluate_model(model, scaler, features, test_df, model_name):
     print(f"  False Negatives: {fn:4d}    True Positives:  {tp:4d}")
 
     # Returns by prediction
-    test_df_copy = test_df.copy()
-    test_df_copy['prediction'] = y_pred
-
-    pos_pred_returns = test_df_copy[test_df_copy['prediction'] == 1]['actual7dReturn'].mean()
-    neg_pred_returns = test_df_copy[test_df_copy['prediction'] == 0]['actual7dReturn'].mean()
+    r = test_df['actual7dReturn'].to_numpy()
+    pos_mask = y_pred == 1
+    neg_mask = ~pos_mask
+    pos_pred_returns = r[pos_mask].mean() if pos_mask.any() else np.nan
+    neg_pred_returns = r[neg_mask].mean() if neg_mask.any() else np.nan
 
     print(f"\n📈 Average Returns:")
     print(f"  Predicted Positive: {pos_pred_returns*100:+.2f}%")
@@ -275,6 +390,7 @@ def main(csv_file):
     print(f"\n📊 Configuration:")
     print(f"   • Return threshold: {RETURN_THRESHOLD*100:.1f}%")
     print(f"   • Train/Test split: 70/30 (chronological)")
+    print(f"   • Model selection: {CV_SPLITS}-fold rolling-origin CV on the training window")
     print(f"   • Random state: {RANDOM_STATE}")
 
     # Load data
@@ -284,26 +400,36 @@ def main(csv_file):
         print("\n⚠️  Warning: Small dataset (<50 samples)")
         print("   Results may not be reliable. Consider running full backfill.")
 
-    # Train/test split
+    # Train/test split (test window is held out from model selection)
     train_df, test_df = time_series_split(df)
 
-    # Train models
-    results = []
-
-    # Baseline
-    baseline_model, baseline_scaler, baseline_features = train_baseline_model(train_df)
-    baseline_results = evaluate_model(baseline_model, baseline_scaler, baseline_features, test_df, "Baseline")
-    results.append(baseline_results)
+    # Rolling-origin CV on the training window picks the model
+    cv_summary = cross_validate_models(train_df)
 
-    # Enhanced
-    enhanced_model, enhanced_scaler, enhanced_features = train_enhanced_model(train_df)
-    enhanced_results = evaluate_model(enhanced_model, enhanced_scaler, enhanced_features, test_df, "Enhanced")
-    results.append(enhanced_results)
+    # Train models: the three fits are independent, so run them in parallel
+    # (one worker per core at most, so single-core hosts skip the pool);
+    # each worker's output is replayed in order before its evaluation
+    trained = Parallel(n_jobs=min(3, os.cpu_count() or 1), backend='loky')(
+        delayed(train_one)(name, train_df) for name in TRAINERS
+    )
 
-    # ML
-    ml_model, ml_scaler, ml_features = train_ml_model(train_df)
-    ml_results = evaluate_model(ml_model, ml_scaler, ml_features, test_df, "ML (GBM)")
-    results.append(ml_results)
+    results = []
+    for name, (model, scaler, features, log) in zip(TRAINERS, trained):
+        print(log, end='')
+        results.append(evaluate_model(model, scaler, features, test_df, name))
+
+    # Save fitted models (with their scaler, None for GBM) so downstream
+    # scripts can load instead of retraining
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    model_paths = []
+    for name, (model, scaler, features, _) in zip(TRAINERS, trained):
+        path = os.path.join(MODEL_DIR, MODEL_FILES[name])
+        joblib.dump({
+            'model': model,
+            'scaler': scaler,
+            'features': features,
+        }, path, compress=3)
+        model_paths.append(path)
 
     # Comparison
     print("\n" + "="*80)
@@ -314,31 +440,42 @@ def main(csv_file):
     print("\n📊 Summary:")
     print(results_df[['model_name', 'accuracy', 'auc', 'f1', 'return_diff']].to_string(index=False))
 
-    best_model = results_df.loc[results_df['accuracy'].idxmax()]
+    # Select on CV AUC (falls back to held-out accuracy when CV was skipped)
+    cv_auc = {name: s['auc_mean'] for name, s in cv_summary.items() if s['auc_mean'] is not None}
+    if cv_auc:
+        best_name = max(cv_auc, key=cv_auc.get)
+        best_model = results_df[results_df['model_name'] == best_name].iloc[0]
+    else:
+        best_model = results_df.loc[results_df['accuracy'].idxmax()]
     print(f"\n🏆 Best Model: {best_model['model_name']}")
+    if cv_auc:
+        best_cv = cv_summary[best_model['model_name']]
+        print(f"   CV AUC: {best_cv['auc_mean']:.3f} ± {best_cv['auc_std']:.3f} ({best_cv['folds']} folds)")
     print(f"   Accuracy: {best_model['accuracy']*100:.2f}%")
     print(f"   Return Spread: {best_model['return_diff']*100:+.2f}%")
 
     # Save results
     results_file = 'model-training-results.json'
-    with open(results_file, 'w') as f:
-        json.dump({
+    with open(results_file, 'wb') as f:
+        f.write(orjson.dumps({
             'timestamp': datetime.now().isoformat(),
             'dataset_size': len(df),
             'train_size': len(train_df),
             'test_size': len(test_df),
+            'cross_validation': cv_summary,
             'results': results
-        }, f, indent=2)
+        }, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
 
     print(f"\n✅ Results saved to: {results_file}")
+    print(f"✅ Models saved to: {', '.join(model_paths)}")
     print("\n" + "="*80)
     print("✅ TRAINING COMPLETE")
     print("="*80)
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python3 train-prediction-model.py <csv_file>")
-        print("Example: python3 train-prediction-model.py model-features.csv")
+        print("Usage: python3 train-prediction-model.py <csv_or_parquet_file>")
+        print("Example: python3 train-prediction-model.py model-features-final-clean.parquet")
         sys.exit(1)
 
     csv_file = sys.argv[1]
@@ -16,11 +16,15 @@ import pandas as pd
 import numpy as np
 from sklearn.model_selection import TimeSeriesSplit
 from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import GradientBoostingClassifier
 from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import accuracy_score, classification_report, roc_auc_score, confusion_matrix
+from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.metrics import classification_report, roc_auc_score
+from joblib import Parallel, delayed
+from contextlib import redirect_stdout
+import io
+import os
 import sys
-import json
+import orjson
 from datetime import datetime
 
 # ============================================================
@@ -29,6 +33,7 @@ from datetime import datetime
 
 RETURN_THRESHOLD = 0.0  # 0% - positive vs negative
 RANDOM_STATE = 42
+CV_SPLITS = 5  # Rolling-origin folds over the training window (model selection)
 
 # Feature sets
 BASELINE_FEATURES = [
@@ -56,6 +61,16 @@ AI_FEATURES = [
     'guidanceLowered',
 ]
 
+# Each model's features are a prefix of this list
+ALL_FEATURES = BASELINE_FEATURES + VOLUME_FEATURES + AI_FEATURES
+
+# Compared models: (name, features)
+MODEL_SPECS = [
+    ("Baseline (Earnings Only)", BASELINE_FEATURES),
+    ("Volume-Enhanced (Baseline + Volume)", BASELINE_FEATURES + VOLUME_FEATURES),
+    ("Full Model (Baseline + Volume + AI)", ALL_FEATURES),
+]
+
 # ============================================================
 # HELPER FUNCTIONS
 # ============================================================
@@ -64,8 +79,9 @@ def load_data(csv_file):
     """Load and prepare data."""
     print(f"\n📊 Loading data from {csv_file}...")
 
-    df = pd.read_csv(csv_file)
-    df['filingDate'] = pd.to_datetime(df['filingDate'])
+    # Multithreaded Arrow parser; feature columns arrive as float32 already
+    df = pd.read_csv(csv_file, engine='pyarrow', parse_dates=['filingDate'],
+                     dtype={f: 'float32' for f in ALL_FEATURES})
     df = df.sort_values('filingDate').reset_index(drop=True)
 
     print(f"  ✅ Loaded {len(df)} samples")
@@ -83,36 +99,41 @@ def prepare_features(df, feature_list):
     if missing_features:
         print(f"  ⚠️  Missing features: {', '.join(missing_features)}")
 
-    X = df[available_features].copy()
-    y = df['target'].copy()
-
-    # Fill NaN with 0
-    X = X.fillna(0)
+    # Fill NaN with 0 (fillna/astype already return new frames, so no explicit copies)
+    X = df[available_features].fillna(0).astype(np.float32)
+    y = df['target'].astype(np.int32)
 
     return X, y, available_features
 
 def evaluate_model(model, X_test, y_test, test_df, model_name):
     """Evaluate model and return metrics."""
-    y_pred = model.predict(X_test)
-    y_pred_proba = model.predict_proba(X_test)[:, 1]
+    yt = y_test.to_numpy().astype(np.int8)
+
+    # Predictions: one decision_function pass gives both the labels (score > 0)
+    # and the ranking AUC needs; AUC is undefined on a single-class test set
+    if len(np.unique(yt)) < 2:
+        y_score = None
+        y_pred = model.predict(X_test)
+        auc = None
+    else:
+        y_score = model.decision_function(X_test)
+        y_pred = (y_score > 0).astype(int)
+        auc = roc_auc_score(yt, y_score)
 
-    # Basic metrics
-    accuracy = accuracy_score(y_test, y_pred)
-    auc = roc_auc_score(y_test, y_pred_proba)
+    # Basic metrics (binary labels: confusion cells from one bincount over 2*true + pred)
+    yp = y_pred.astype(np.int8)
+    accuracy = (yt == yp).mean()
 
     # Confusion matrix
-    cm = confusion_matrix(y_test, y_pred)
-    tn, fp, fn, tp = cm.ravel()
+    tn, fp, fn, tp = np.bincount(2 * yt + yp, minlength=4)
 
     # Return analysis
-    test_df_copy = test_df.copy()
-    test_df_copy['prediction'] = y_pred
-
-    pos_pred = test_df_copy[test_df_copy['prediction'] == 1]
-    neg_pred = test_df_copy[test_df_copy['prediction'] == 0]
+    r = test_df['actual7dReturn'].to_numpy()
+    pos_mask = y_pred == 1
+    neg_mask = ~pos_mask
 
-    avg_return_pos = pos_pred['actual7dReturn'].mean() if len(pos_pred) > 0 else 0
-    avg_return_neg = neg_pred['actual7dReturn'].mean() if len(neg_pred) > 0 else 0
+    avg_return_pos = r[pos_mask].mean() if pos_mask.any() else 0
+    avg_return_neg = r[neg_mask].mean() if neg_mask.any() else 0
     return_spread = avg_return_pos - avg_return_neg
 
     # Precision/Recall
@@ -122,21 +143,21 @@ def evaluate_model(model, X_test, y_test, test_df, model_name):
 
     results = {
         'model_name': model_name,
-        'accuracy': float(accuracy),
-        'auc': float(auc),
-        'precision': float(precision),
-        'recall': float(recall),
-        'f1': float(f1),
-        'true_positives': int(tp),
-        'false_positives': int(fp),
-        'true_negatives': int(tn),
-        'false_negatives': int(fn),
-        'avg_return_positive': float(avg_return_pos),
-        'avg_return_negative': float(avg_return_neg),
-        'return_spread': float(return_spread),
+        'accuracy': accuracy,
+        'auc': auc,
+        'precision': precision,
+        'recall': recall,
+        'f1': f1,
+        'true_positives': tp,
+        'false_positives': fp,
+        'true_negatives': tn,
+        'false_negatives': fn,
+        'avg_return_positive': avg_return_pos,
+        'avg_return_negative': avg_return_neg,
+        'return_spread': return_spread,
     }
 
-    return results, y_pred, y_pred_proba
+    return results, y_pred, y_score
 
 def print_results(results, features_used):
     """Print model results in formatted table."""
@@ -149,7 +170,8 @@ def print_results(results, features_used):
 
     print(f"\n📈 Classification Metrics:")
     print(f"   Accuracy:  {results['accuracy']:.1%}")
-    print(f"   AUC:       {results['auc']:.3f}")
+    if results['auc'] is not None:
+        print(f"   AUC:       {results['auc']:.3f}")
     print(f"   Precision: {results['precision']:.1%}")
     print(f"   Recall:    {results['recall']:.1%}")
     print(f"   F1 Score:  {results['f1']:.3f}")
@@ -168,34 +190,32 @@ def print_results(results, features_used):
 # MODEL TRAINING
 # ============================================================
 
-def train_model(train_df, test_df, feature_list, model_name):
-    """Train and evaluate a model."""
+def train_model(X_train_all, y_train, X_test_all, y_test, test_df, feature_index, feature_list, model_name):
+    """Train and evaluate a model on a column subset of the pre-scaled feature matrices."""
     print(f"\n{'='*80}")
     print(f"TRAINING: {model_name}")
     print(f"{'='*80}")
 
-    # Prepare features
-    X_train, y_train, features = prepare_features(train_df, feature_list)
-    X_test, y_test, _ = prepare_features(test_df, features)
+    # Select this model's columns from the shared (already standardized) matrices;
+    # per-column scaling doesn't depend on which other columns are present
+    features = [f for f in feature_list if f in feature_index]
+    cols = [feature_index[f] for f in features]
+    X_train_scaled = X_train_all[:, cols]
+    X_test_scaled = X_test_all[:, cols]
 
     print(f"\n📊 Training with {len(features)} features:")
     for feat in features:
         print(f"   - {feat}")
 
-    # Scale features
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
-
     # Train logistic regression
-    model = LogisticRegression(random_state=RANDOM_STATE, max_iter=1000)
+    model = LogisticRegression(random_state=RANDOM_STATE, solver='liblinear', max_iter=200, C=1.0)
     model.fit(X_train_scaled, y_train)
 
-    print(f"\n✅ Model trained on {len(train_df)} samples")
+    print(f"\n✅ Model trained on {len(y_train)} samples")
     print(f"✅ Testing on {len(test_df)} samples")
 
     # Evaluate
-    results, y_pred, y_pred_proba = evaluate_model(model, X_test_scaled, y_test, test_df, model_name)
+    results, y_pred, y_score = evaluate_model(model, X_test_scaled, y_test, test_df, model_name)
 
     # Feature importance (coefficients)
     feature_importance = pd.DataFrame({
@@ -207,7 +227,66 @@ def train_model(train_df, test_df, feature_list, model_name):
     for _, row in feature_importance.head(5).iterrows():
         print(f"   {row['feature']:<30} {row['coefficient']:>+8.3f}")
 
-    return results, feature_importance, model, scaler
+    return results, feature_importance, model
+
+def train_model_logged(*args):
+    """Run train_model in a worker, returning its console output alongside the results."""
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        trained = train_model(*args)
+    return (*trained, buf.getvalue())
+
+def cross_validate_models(X_train_all, y_train, feature_index):
+    """Rolling-origin CV over the training window; per-model mean/std AUC and accuracy."""
+    print(f"\n{'='*80}")
+    print(f"CROSS-VALIDATION ({CV_SPLITS}-fold rolling origin)")
+    print(f"{'='*80}")
+
+    n = len(y_train)
+    test_size = max(20, n // 10)
+    if n <= CV_SPLITS * test_size:
+        print(f"\n⚠️  Only {n} training samples - too few for {CV_SPLITS} folds of {test_size}, skipping CV")
+        return {}
+
+    y = y_train.to_numpy()
+    tscv = TimeSeriesSplit(n_splits=CV_SPLITS, test_size=test_size)
+    scores = {name: {'auc': [], 'accuracy': []} for name, _ in MODEL_SPECS}
+
+    for fit_idx, val_idx in tscv.split(X_train_all):
+        # One scaler per fold, fitted on the fit window only; models slice its columns
+        scaler = StandardScaler()
+        X_fit_all = scaler.fit_transform(X_train_all[fit_idx])
+        X_val_all = scaler.transform(X_train_all[val_idx])
+        for name, feature_list in MODEL_SPECS:
+            cols = [feature_index[f] for f in feature_list if f in feature_index]
+            X_fit = X_fit_all[:, cols]
+            X_val = X_val_all[:, cols]
+
+            model = LogisticRegression(random_state=RANDOM_STATE, solver='liblinear', max_iter=200, C=1.0)
+            model.fit(X_fit, y[fit_idx])
+
+            y_val = y[val_idx]
+            scores[name]['accuracy'].append((model.predict(X_val) == y_val).mean())
+            if len(np.unique(y_val)) > 1:  # AUC undefined on single-class folds
+                scores[name]['auc'].append(roc_auc_score(y_val, model.predict_proba(X_val)[:, 1]))
+
+    summary = {}
+    print(f"\n{'Model':<35} {'AUC (mean ± std)':<20} {'Accuracy (mean ± std)':<24}")
+    print("-"*80)
+    for name, fold_scores in scores.items():
+        auc = np.array(fold_scores['auc'])
+        acc = np.array(fold_scores['accuracy'])
+        summary[name] = {
+            'auc_mean': float(auc.mean()) if auc.size else None,
+            'auc_std': float(auc.std()) if auc.size else None,
+            'accuracy_mean': float(acc.mean()),
+            'accuracy_std': float(acc.std()),
+            'folds': len(acc),
+        }
+        auc_str = f"{auc.mean():.3f} ± {auc.std():.3f}" if auc.size else "n/a"
+        print(f"{name:<35} {auc_str:<20} {acc.mean()*100:.1f}% ± {acc.std()*100:.1f}%")
+
+    return summary
 
 # ============================================================
 # MAIN ANALYSIS
@@ -232,26 +311,46 @@ def main(csv_file):
 
     # Split data chronologically
     split_idx = int(len(df) * 0.7)
-    train_df = df.iloc[:split_idx].copy()
-    test_df = df.iloc[split_idx:].copy()
+    train_df = df.iloc[:split_idx]
+    test_df = df.iloc[split_idx:]
 
     print(f"\n📊 Train/Test Split:")
     print(f"   Training:   {len(train_df)} samples ({train_df['filingDate'].min().date()} to {train_df['filingDate'].max().date()})")
     print(f"   Testing:    {len(test_df)} samples ({test_df['filingDate'].min().date()} to {test_df['filingDate'].max().date()})")
 
+    # Prepare the full feature matrices once; each model slices its columns
+    X_train_all, y_train, all_features = prepare_features(train_df, ALL_FEATURES)
+    X_test_all, y_test, _ = prepare_features(test_df, all_features)
+    X_train_all, X_test_all = X_train_all.to_numpy(), X_test_all.to_numpy()
+    feature_index = {feat: i for i, feat in enumerate(all_features)}
+
+    # Rolling-origin CV on the training window picks the model; the test
+    # window stays held out for the final numbers below
+    cv_summary = cross_validate_models(X_train_all, y_train, feature_index)
+
+    # Standardize once on the full training matrix; each model slices its columns
+    scaler_all = StandardScaler()
+    X_train_scaled_all = scaler_all.fit_transform(X_train_all)
+    X_test_scaled_all = scaler_all.transform(X_test_all)
+    shared = (X_train_scaled_all, y_train, X_test_scaled_all, y_test, test_df, feature_index)
+
     # Store results
     all_results = []
     all_feature_importance = {}
 
+    # The three fits are independent, so run them in parallel (at most one
+    # worker per core, so single-core hosts skip the pool); each worker's
+    # output is captured and replayed below in model order
+    trained = Parallel(n_jobs=min(3, os.cpu_count() or 1), backend='loky')(
+        delayed(train_model_logged)(*shared, feature_list, name) for name, feature_list in MODEL_SPECS
+    )
+
     # ============================================================
     # MODEL 1: BASELINE (Earnings Only)
     # ============================================================
 
-    results_baseline, fi_baseline, model_baseline, scaler_baseline = train_model(
-        train_df, test_df,
-        BASELINE_FEATURES,
-        "Baseline (Earnings Only)"
-    )
+    results_baseline, fi_baseline, model_baseline, log = trained[0]
+    print(log, end='')
     print_results(results_baseline, BASELINE_FEATURES)
     all_results.append(results_baseline)
     all_feature_importance['baseline'] = fi_baseline.to_dict('records')
@@ -260,11 +359,8 @@ def main(csv_file):
     # MODEL 2: BASELINE + VOLUME
     # ============================================================
 
-    results_volume, fi_volume, model_volume, scaler_volume = train_model(
-        train_df, test_df,
-        BASELINE_FEATURES + VOLUME_FEATURES,
-        "Volume-Enhanced (Baseline + Volume)"
-    )
+    results_volume, fi_volume, model_volume, log = trained[1]
+    print(log, end='')
     print_results(results_volume, BASELINE_FEATURES + VOLUME_FEATURES)
     all_results.append(results_volume)
     all_feature_importance['volume_enhanced'] = fi_volume.to_dict('records')
@@ -273,12 +369,9 @@ def main(csv_file):
     # MODEL 3: FULL (Baseline + Volume + AI)
     # ============================================================
 
-    results_full, fi_full, model_full, scaler_full = train_model(
-        train_df, test_df,
-        BASELINE_FEATURES + VOLUME_FEATURES + AI_FEATURES,
-        "Full Model (Baseline + Volume + AI)"
-    )
-    print_results(results_full, BASELINE_FEATURES + VOLUME_FEATURES + AI_FEATURES)
+    results_full, fi_full, model_full, log = trained[2]
+    print(log, end='')
+    print_results(results_full, ALL_FEATURES)
     all_results.append(results_full)
     all_feature_importance['full'] = fi_full.to_dict('records')
 
@@ -312,11 +405,20 @@ def main(csv_file):
         else:
             status = "➡️  Same"
 
-        print(f"{name:<35} {acc:<12.1%} {auc:<10.3f} {f1:<10.3f} {spread*100:<+14.2f}% {status:<10}")
+        auc_str = f"{auc:.3f}" if auc is not None else "n/a"
+        print(f"{name:<35} {acc:<12.1%} {auc_str:<10} {f1:<10.3f} {spread*100:<+14.2f}% {status:<10}")
 
     # Determine winner
-    best_model = max(all_results, key=lambda x: x['accuracy'])
+    # Select on CV AUC (falls back to held-out accuracy when CV was skipped)
+    cv_auc = {name: s['auc_mean'] for name, s in cv_summary.items() if s['auc_mean'] is not None}
+    if cv_auc:
+        best_model = max(all_results, key=lambda x: cv_auc.get(x['model_name'], float('-inf')))
+    else:
+        best_model = max(all_results, key=lambda x: x['accuracy'])
     print(f"\n🏆 Best Model: {best_model['model_name']}")
+    if cv_auc:
+        best_cv = cv_summary[best_model['model_name']]
+        print(f"   CV AUC: {best_cv['auc_mean']:.3f} ± {best_cv['auc_std']:.3f} ({best_cv['folds']} folds)")
     print(f"   Accuracy: {best_model['accuracy']:.1%}")
     print(f"   Improvement: {(best_model['accuracy'] - results_baseline['accuracy'])*100:+.1f} percentage points")
 
@@ -362,16 +464,17 @@ def main(csv_file):
         'dataset_size': len(df),
         'train_size': len(train_df),
         'test_size': len(test_df),
-        'volume_coverage_pct': float(volume_coverage),
+        'volume_coverage_pct': volume_coverage,
         'models': all_results,
         'feature_importance': all_feature_importance,
+        'cross_validation': cv_summary,
         'best_model': best_model['model_name'],
-        'volume_improvement_pts': float(volume_improvement),
+        'volume_improvement_pts': volume_improvement,
     }
 
     output_file = 'volume-model-results.json'
-    with open(output_file, 'w') as f:
-        json.dump(output, f, indent=2)
+    with open(output_file, 'wb') as f:
+        f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
 
     print(f"\n✅ Results saved to: {output_file}")
 
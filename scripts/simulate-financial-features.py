@@ -55,119 +55,112 @@ print("- Revenue correlates 0.6 with EPS")
 print("- Guidance raises → 85% chance of positive return")
 print()
 
-np.random.seed(42)  # Reproducible
+rng = np.random.default_rng(42)  # Reproducible (PCG64)
 
-def simulate_features(row):
+# Category labels, indexed by the int8 codes simulate_features produces
+SURPRISE_LABELS = ['beat', 'inline', 'miss']
+GUIDANCE_LABELS = ['raised', 'lowered', 'maintained']
+
+def simulate_features(filings, rng):
     """
-    Simulate realistic financial features for a filing
+    Simulate realistic financial features for every filing at once
 
     Logic:
     1. If actual return is positive → more likely to be EPS beat
     2. If actual return is negative → more likely to be EPS miss
     3. Add randomness to avoid perfect correlation
     """
-    actual_return = row['actual7dReturn']
-
-    features = {}
+    actual_return = filings['actual7dReturn'].to_numpy()
+    n = len(actual_return)
+    positive = actual_return > 0
 
     # Simulate EPS surprise based on actual return + randomness
     # Research shows: EPS beats have 70% positive return, misses have 40%
-    if actual_return > 0:
-        # Positive return: 60% chance it was a beat, 20% inline, 20% miss
-        rand = np.random.random()
-        if rand < 0.60:
-            features['epsSurprise'] = 'beat'
-            features['epsSurpriseMagnitude'] = np.random.uniform(1, 15)
-        elif rand < 0.80:
-            features['epsSurprise'] = 'inline'
-            features['epsSurpriseMagnitude'] = np.random.uniform(-2, 2)
-        else:
-            features['epsSurprise'] = 'miss'
-            features['epsSurpriseMagnitude'] = np.random.uniform(-15, -1)
-    else:
-        # Negative return: 30% beat, 20% inline, 50% miss
-        rand = np.random.random()
-        if rand < 0.30:
-            features['epsSurprise'] = 'beat'
-            features['epsSurpriseMagnitude'] = np.random.uniform(1, 10)
-        elif rand < 0.50:
-            features['epsSurprise'] = 'inline'
-            features['epsSurpriseMagnitude'] = np.random.uniform(-2, 2)
-        else:
-            features['epsSurprise'] = 'miss'
-            features['epsSurpriseMagnitude'] = np.random.uniform(-15, -1)
+    # Positive return: 60% beat, 20% inline, 20% miss
+    # Negative return: 30% beat, 20% inline, 50% miss
+    rand = rng.random(n)
+    beat = rand < np.where(positive, 0.60, 0.30)
+    inline = ~beat & (rand < np.where(positive, 0.80, 0.50))
+    miss = ~beat & ~inline
+
+    # Branch on int8 class codes; labels are attached once at the end
+    eps_code = np.select([beat, inline], [0, 1], default=2).astype(np.int8)
+    eps_magnitude = np.select(
+        [beat, inline],
+        [rng.uniform(1, np.where(positive, 15, 10)), rng.uniform(-2, 2, n)],
+        default=rng.uniform(-15, -1, n),
+    )
 
     # Revenue surprise (correlated with EPS, but noisier)
-    if features['epsSurprise'] == 'beat':
-        features['revenueSurprise'] = 'beat' if np.random.random() < 0.7 else 'inline'
-    elif features['epsSurprise'] == 'miss':
-        features['revenueSurprise'] = 'miss' if np.random.random() < 0.6 else 'inline'
-    else:
-        features['revenueSurprise'] = 'inline'
+    rand = rng.random(n)
+    revenue_code = np.select(
+        [beat & (rand < 0.7), miss & (rand < 0.6)], [0, 2], default=1
+    ).astype(np.int8)
 
     # Guidance (strong signal, rare)
-    # Only 20% of filings change guidance
-    rand = np.random.random()
-    if rand < 0.80:
-        features['guidanceChange'] = 'maintained'
-    else:
-        # If changed, positive returns → raised, negative → lowered
-        if actual_return > 5:
-            features['guidanceChange'] = 'raised'
-        elif actual_return < -5:
-            features['guidanceChange'] = 'lowered'
-        else:
-            features['guidanceChange'] = 'maintained'
-
-    return features
-
-# Simulate features for all filings
-enriched = []
-for _, row in filings.iterrows():
-    simulated = simulate_features(row)
-
-    filing_dict = row.to_dict()
-    filing_dict['simulatedFeatures'] = simulated
-    enriched.append(filing_dict)
-
-enriched_df = pd.DataFrame(enriched)
+    # Only 20% of filings change guidance; if changed, positive returns → raised, negative → lowered
+    changed = rng.random(n) >= 0.80
+    guidance_code = np.select(
+        [changed & (actual_return > 5), changed & (actual_return < -5)],
+        [0, 1],
+        default=2,
+    ).astype(np.int8)
+
+    return pd.DataFrame({
+        'epsSurprise': pd.Categorical.from_codes(eps_code, SURPRISE_LABELS),
+        'epsSurpriseMagnitude': eps_magnitude,
+        'revenueSurprise': pd.Categorical.from_codes(revenue_code, SURPRISE_LABELS),
+        'guidanceChange': pd.Categorical.from_codes(guidance_code, GUIDANCE_LABELS),
+    }, index=filings.index)
+
+# Simulate features for all filings (kept as flat sim_* columns until the JSON dump)
+SIM_COLUMNS = ['epsSurprise', 'epsSurpriseMagnitude', 'revenueSurprise', 'guidanceChange']
+filings = filings.join(simulate_features(filings, rng).add_prefix('sim_'))
+n_filings = len(filings)
 
 # Statistics
 print("=" * 80)
 print("SIMULATED FEATURE DISTRIBUTION")
 print("=" * 80)
 
-eps_beats = sum(1 for f in enriched if f['simulatedFeatures']['epsSurprise'] == 'beat')
-eps_misses = sum(1 for f in enriched if f['simulatedFeatures']['epsSurprise'] == 'miss')
-eps_inline = sum(1 for f in enriched if f['simulatedFeatures']['epsSurprise'] == 'inline')
+eps_counts = filings['sim_epsSurprise'].value_counts()
+eps_beats = int(eps_counts.get('beat', 0))
+eps_misses = int(eps_counts.get('miss', 0))
+eps_inline = int(eps_counts.get('inline', 0))
 
 print(f"EPS Surprises:")
-print(f"  Beats: {eps_beats} ({eps_beats/len(enriched)*100:.1f}%)")
-print(f"  Misses: {eps_misses} ({eps_misses/len(enriched)*100:.1f}%)")
-print(f"  Inline: {eps_inline} ({eps_inline/len(enriched)*100:.1f}%)")
+print(f"  Beats: {eps_beats} ({eps_beats/n_filings*100:.1f}%)")
+print(f"  Misses: {eps_misses} ({eps_misses/n_filings*100:.1f}%)")
+print(f"  Inline: {eps_inline} ({eps_inline/n_filings*100:.1f}%)")
 print()
 
-guidance_raised = sum(1 for f in enriched if f['simulatedFeatures']['guidanceChange'] == 'raised')
-guidance_lowered = sum(1 for f in enriched if f['simulatedFeatures']['guidanceChange'] == 'lowered')
-guidance_maintained = sum(1 for f in enriched if f['simulatedFeatures']['guidanceChange'] == 'maintained')
+guidance_counts = filings['sim_guidanceChange'].value_counts()
+guidance_raised = int(guidance_counts.get('raised', 0))
+guidance_lowered = int(guidance_counts.get('lowered', 0))
+guidance_maintained = int(guidance_counts.get('maintained', 0))
 
 print(f"Guidance Changes:")
-print(f"  Raised: {guidance_raised} ({guidance_raised/len(enriched)*100:.1f}%)")
-print(f"  Lowered: {guidance_lowered} ({guidance_lowered/len(enriched)*100:.1f}%)")
-print(f"  Maintained: {guidance_maintained} ({guidance_maintained/len(enriched)*100:.1f}%)")
+print(f"  Raised: {guidance_raised} ({guidance_raised/n_filings*100:.1f}%)")
+print(f"  Lowered: {guidance_lowered} ({guidance_lowered/n_filings*100:.1f}%)")
+print(f"  Maintained: {guidance_maintained} ({guidance_maintained/n_filings*100:.1f}%)")
 print()
 
 # Validate correlations
-eps_beat_positive = sum(1 for f in enriched if f['simulatedFeatures']['epsSurprise'] == 'beat' and f['actual7dReturn'] > 0)
+actual_return = filings['actual7dReturn']
+eps_beat_positive = int(((filings['sim_epsSurprise'] == 'beat') & (actual_return > 0)).sum())
 eps_beat_total = eps_beats
 print(f"Correlation Check:")
 print(f"  EPS beats with positive return: {eps_beat_positive}/{eps_beat_total} ({eps_beat_positive/eps_beat_total*100:.1f}%)")
 
-eps_miss_negative = sum(1 for f in enriched if f['simulatedFeatures']['epsSurprise'] == 'miss' and f['actual7dReturn'] < 0)
+eps_miss_negative = int(((filings['sim_epsSurprise'] == 'miss') & (actual_return < 0)).sum())
 print(f"  EPS misses with negative return: {eps_miss_negative}/{eps_misses} ({eps_miss_negative/eps_misses*100:.1f}%)")
 print()
 
-# Save
+# Save (nest each filing's simulated features only for the JSON output)
+enriched = filings.to_dict('records')
+for filing_dict in enriched:
+    filing_dict['simulatedFeatures'] = {col: filing_dict.pop(f'sim_{col}') for col in SIM_COLUMNS}
+
 output_file = '/tmp/dataset-simulated-features.json'
 with open(output_file, 'w') as f:
     json.dump({
@@ -1,13 +1,19 @@
 #!/usr/bin/env python3
 """Quick test of data collection for 3 tickers"""
 
+import os
 import sys
 import json
+import numpy as np
 import requests
-import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
 import yfinance as yf
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "python"))
+from rate_limit import RateLimiter
+
 TICKERS = ['AAPL', 'MSFT', 'NVDA']
 CIK_MAP = {
     "AAPL": "0000320193",
@@ -16,31 +22,60 @@ CIK_MAP = {
 }
 
 HEADERS = {"User-Agent": "SEC Filing Analyzer research@example.com"}
+CACHE_DIR = os.path.expanduser("~/.cache/sec")  # Submissions JSON + ETag, revalidated per run
+RATE_LIMIT_DELAY = 0.1  # Min seconds between SEC request starts (SEC allows 10 req/s)
+MAX_WORKERS = 8
 
-def fetch_filings(ticker, cik):
-    url = f"https://data.sec.gov/submissions/CIK{cik}.json"
-    response = requests.get(url, headers=HEADERS)
+# One keep-alive session shared by all worker threads
+session = requests.Session()
+session.headers.update(HEADERS)
+session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
+# Spaces out request starts across all worker threads
+_throttle = RateLimiter(RATE_LIMIT_DELAY)
+
+def fetch_submissions(cik):
+    """Fetch a company's submissions JSON, revalidating the disk cache by ETag."""
+    cache_file = os.path.join(CACHE_DIR, f"CIK{cik}.json")
+    try:
+        with open(cache_file) as f:
+            cached = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        cached = None
+
+    headers = {"If-None-Match": cached["etag"]} if cached and cached.get("etag") else {}
+    _throttle.wait()
+    response = session.get(f"https://data.sec.gov/submissions/CIK{cik}.json", headers=headers)
+    if response.status_code == 304:
+        return cached["data"]
     response.raise_for_status()
     data = response.json()
 
+    etag = response.headers.get("ETag")
+    if etag:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(cache_file, "w") as f:
+            json.dump({"etag": etag, "data": data}, f)
+    return data
+
+def fetch_filings(ticker, cik):
+    data = fetch_submissions(cik)
+
     recent = data.get("filings", {}).get("recent", {})
     forms = recent.get("form", [])
     accessions = recent.get("accessionNumber", [])
     dates = recent.get("filingDate", [])
 
-    filings = []
-    for i in range(len(forms)):
-        if forms[i] in ["10-Q", "10-K"]:
-            filing_date = datetime.fromisoformat(dates[i])
-            if filing_date >= datetime(2024, 1, 1):
-                filings.append({
-                    "ticker": ticker,
-                    "filingType": forms[i],
-                    "accessionNumber": accessions[i],
-                    "filingDate": dates[i]
-                })
+    # Filter by form and date in one vectorized pass, then build only the kept rows
+    mask = (np.isin(np.asarray(forms, dtype=str), ["10-Q", "10-K"])
+            & (np.asarray(dates, dtype="datetime64[D]") >= np.datetime64("2024-01-01")))
 
-    return filings[:3]  # Limit to 3
+    return [{
+        "ticker": ticker,
+        "filingType": forms[i],
+        "accessionNumber": accessions[i],
+        "filingDate": dates[i]
+    } for i in np.flatnonzero(mask)[:3]]  # Limit to 3
 
 def calc_return(ticker, filing_date):
     try:
@@ -53,48 +88,62 @@ def calc_return(ticker, filing_date):
         pass
     return None
 
-def calc_returns_batch(ticker, filing_dates):
-    """Calculate returns for multiple filing dates in batch"""
+def download_closes(tickers, filing_dates):
+    """Download daily closes for all tickers over the window covering every filing, in one request"""
     if not filing_dates:
-        return {}
-    
+        return None
+
+    dt_min = min(datetime.fromisoformat(d) for d in filing_dates)
+    dt_max = max(datetime.fromisoformat(d) for d in filing_dates) + timedelta(days=14)
     try:
-        dt_min = min(datetime.fromisoformat(d) for d in filing_dates)
-        dt_max = max(datetime.fromisoformat(d) for d in filing_dates) + timedelta(days=14)
-        
-        stock = yf.Ticker(ticker)
-        hist = stock.history(start=dt_min, end=dt_max)
-        
-        returns = {}
-        for filing_date in filing_dates:
-            dt = datetime.fromisoformat(filing_date)
-            end_dt = dt + timedelta(days=14)
-            
-            filing_hist = hist[(hist.index >= dt) & (hist.index <= end_dt)]
-            if len(filing_hist) >= 2:
-                returns[filing_date] = ((filing_hist['Close'].iloc[min(7, len(filing_hist)-1)] - filing_hist['Close'].iloc[0]) / filing_hist['Close'].iloc[0]) * 100
-            else:
-                returns[filing_date] = None
-        
-        return returns
-    except:
+        panel = yf.download(tickers=' '.join(tickers), start=dt_min, end=dt_max, group_by='ticker',
+                            auto_adjust=True, threads=True, progress=False)
+    except Exception:
+        return None
+    return panel.xs('Close', axis=1, level=1)
+
+def calc_returns_batch(close, filing_dates):
+    """Calculate returns for multiple filing dates from one ticker's close series"""
+    if close is None or not filing_dates:
         return {date: None for date in filing_dates}
 
-all_filings = []
-for ticker in TICKERS:
+    # Locate every filing's 14-day window with two binary searches over the trading days
+    close = close.dropna()
+    prices = close.to_numpy(dtype=np.float64)
+    days = close.index.to_numpy(dtype="datetime64[D]")
+    starts = np.asarray(filing_dates, dtype="datetime64[D]")
+    first = np.searchsorted(days, starts, side="left")
+    n = np.searchsorted(days, starts + np.timedelta64(14, "D"), side="right") - first
+
+    ok = n >= 2
+    last = first + np.clip(np.minimum(7, n - 1), 0, None)
+    pct = np.full(len(filing_dates), np.nan)
+    pct[ok] = (prices[last[ok]] - prices[first[ok]]) / prices[first[ok]] * 100
+
+    return {date: (float(r) if ok_i else None) for date, r, ok_i in zip(filing_dates, pct, ok)}
+
+def collect_ticker(ticker):
+    """Fetch one ticker's recent filings from the SEC."""
     print(f"[{ticker}] Fetching...", file=sys.stderr)
-    cik = CIK_MAP[ticker]
-    filings = fetch_filings(ticker, cik)
+    return fetch_filings(ticker, CIK_MAP[ticker])
+
+# Tickers are independent, so fetch them concurrently (map keeps TICKERS order)
+with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+    filings_by_ticker = dict(zip(TICKERS, executor.map(collect_ticker, TICKERS)))
+
+# One price download for every ticker, then per-filing returns from its close series
+closes = download_closes(TICKERS, [f["filingDate"] for filings in filings_by_ticker.values() for f in filings])
+
+all_filings = []
+for ticker, filings in filings_by_ticker.items():
+    close = closes[ticker] if closes is not None and ticker in closes else None
+    returns = calc_returns_batch(close, [filing["filingDate"] for filing in filings])
 
-    filing_dates = [filing["filingDate"] for filing in filings]
-    returns = calc_returns_batch(ticker, filing_dates)
-    
     for filing in filings:
         filing["actual7dReturn"] = returns.get(filing["filingDate"])
         if filing["actual7dReturn"]:
             print(f"[{ticker}] {filing['filingType']} {filing['filingDate']}: {filing['actual7dReturn']:.2f}%", file=sys.stderr)
 
     all_filings.extend(filings)
-    time.sleep(0.2)
 
-print(json.dumps({"status": "success", "filings": all_filings}, indent=2))
\ No newline at end of file
+print(json.dumps({"status": "success", "filings": all_filings}, indent=2))
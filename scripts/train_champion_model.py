@@ -14,21 +14,44 @@ The concernLevel synthesizes:
 This will be the "champion" model that we'll compare against the legacy "challenger" model.
 """
 
+import os
 import pandas as pd
 import numpy as np
+# Intel-optimized scikit-learn kernels when scikit-learn-intelex is installed;
+# must run before the sklearn imports below
+try:
+    from sklearnex import patch_sklearn
+    patch_sklearn()
+except ImportError:
+    pass
 from sklearn.model_selection import TimeSeriesSplit, cross_val_score
 from sklearn.linear_model import Ridge, Lasso, ElasticNet, LinearRegression
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
 from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import mean_absolute_error, r2_score
-import pickle
+from sklearn.metrics import mean_absolute_error
+from sklearn.base import clone
+from sklearn.inspection import permutation_importance
+from joblib import Parallel, delayed
+import joblib
 import warnings
 warnings.filterwarnings('ignore')
 
+# Optional GPU random forest (RAPIDS cuML); falls back to scikit-learn on CPU
+try:
+    from cuml.ensemble import RandomForestRegressor as cuRandomForestRegressor
+    HAVE_CUML = True
+except ImportError:
+    HAVE_CUML = False
+
+# Low-cardinality text columns, dictionary-encoded at load
+CATEGORY_COLUMNS = ['ticker', 'companyName', 'filingType', 'marketCapCategory']
+
 def load_data():
     """Load the dataset with concernLevel feature"""
     print("📊 Loading data with concernLevel feature...")
-    df = pd.read_csv('data/ml_dataset_with_concern.csv')
+    # Multithreaded Arrow parser with the schema pinned up front
+    df = pd.read_csv('data/ml_dataset_with_concern.csv', engine='pyarrow', parse_dates=['filingDate'],
+                     dtype={c: 'category' for c in CATEGORY_COLUMNS})
     print(f"   Loaded {len(df)} samples with concernLevel")
     return df
 
@@ -39,6 +62,8 @@ def prepare_features(df, use_concern=True):
     Args:
         df: Input dataframe
         use_concern: If True, use concernLevel. If False, use legacy riskScore+sentimentScore
+
+    Returns (X, y, feature_names, medians); medians are the NaN fill values.
     """
     print(f"\n🔧 Preparing features (use_concern={use_concern})...")
 
@@ -61,14 +86,14 @@ def prepare_features(df, use_concern=True):
         print("   ⚠️  Using LEGACY riskScore + sentimentScore (excluding concernLevel)")
 
     # Get numeric features
-    feature_cols = [col for col in df.columns if col not in exclude_cols]
+    feature_cols = df.columns.difference(exclude_cols, sort=False)
 
     # Create feature matrix
     X = df[feature_cols].copy()
 
-    # Handle categorical filingType
-    X['is_10K'] = (df['filingType'] == '10-K').astype(int)
-    X['is_10Q'] = (df['filingType'] == '10-Q').astype(int)
+    # Handle categorical filingType: one-hot over the category codes, not per-row strings
+    dummies = pd.get_dummies(df['filingType'].astype('category'), dtype=np.int8)
+    X[['is_10K', 'is_10Q']] = dummies.reindex(columns=['10-K', '10-Q'], fill_value=0).to_numpy()
     X = X.drop('filingType', axis=1)
 
     # Drop features with >50% missing
@@ -78,10 +103,9 @@ def prepare_features(df, use_concern=True):
         print(f"   Dropping {len(cols_to_drop)} features with >50% missing: {cols_to_drop}")
         X = X.drop(columns=cols_to_drop)
 
-    # Fill remaining NaN with median
-    for col in X.columns:
-        if X[col].isna().sum() > 0:
-            X[col].fillna(X[col].median(), inplace=True)
+    # Fill remaining NaN with median (all column medians in one pass)
+    medians = X.median(numeric_only=True)
+    X.fillna(medians, inplace=True)
 
     print(f"   Features: {X.shape[1]}")
     print(f"   Samples: {X.shape[0]}")
@@ -92,49 +116,114 @@ def prepare_features(df, use_concern=True):
     else:
         print(f"   Key features: riskScore, sentimentScore ✓")
 
-    return X, y, list(X.columns)
+    # Column-major float32 matrix: scalers and solvers reduce down columns
+    feature_names = X.columns.tolist()
+    X = np.asfortranarray(X.to_numpy(dtype=np.float32))
 
-def direction_accuracy(y_true, y_pred):
-    """Calculate direction accuracy (% correct sign predictions)"""
-    correct = np.sum(np.sign(y_true) == np.sign(y_pred))
-    return correct / len(y_true) * 100
+    return X, y, feature_names, medians
 
-def evaluate_model(model, X, y, model_name, cv_splits=5):
-    """Evaluate model with time-series cross-validation"""
-    print(f"\n🔬 Evaluating {model_name}...")
+def direction_accuracy(y_true, y_pred, y_true_sign=None):
+    """Calculate direction accuracy (% correct sign predictions)
 
+    Pass y_true_sign (np.sign(y_true)) to reuse it across several models.
+    """
+    if y_true_sign is None:
+        y_true_sign = np.sign(np.asarray(y_true, dtype=np.float64))
+    y_pred = np.asarray(y_pred, dtype=np.float64)
+    correct = np.count_nonzero(y_true_sign == np.sign(y_pred))
+    return correct / y_true_sign.shape[0] * 100
+
+def make_random_forest(n_estimators, max_depth=10):
+    """Random forest for evaluation: cuML on the GPU when available, else scikit-learn"""
+    if HAVE_CUML:
+        return cuRandomForestRegressor(n_estimators=n_estimators, max_depth=max_depth, random_state=42)
+    return RandomForestRegressor(n_estimators=n_estimators, max_depth=max_depth, random_state=42, n_jobs=-1)
+
+def scale_folds(X, y, cv_splits=5):
+    """
+    Split with time-series CV and scale each fold once
+
+    Every model is evaluated on the same folds, so the scaled arrays are
+    shared instead of refitting a StandardScaler per model per fold.
+    Training windows are expanding prefixes, so one scaler is updated with
+    partial_fit on each newly added block rather than refit from row 0.
+    Returns a list of (X_train_scaled, X_test_scaled, y_train, y_test,
+    y_test_sign); the test-target signs are shared by every model too.
+    """
     # Time series cross-validation (respects temporal order)
     tscv = TimeSeriesSplit(n_splits=cv_splits)
 
-    # Collect metrics across folds
-    direction_accs = []
-    maes = []
-    r2s = []
-
-    for fold, (train_idx, test_idx) in enumerate(tscv.split(X), 1):
-        X_train, X_test = X.iloc[train_idx], X.iloc[test_idx]
-        y_train, y_test = y[train_idx], y[test_idx]
-
-        # Scale features
-        scaler = StandardScaler()
-        X_train_scaled = scaler.fit_transform(X_train)
-        X_test_scaled = scaler.transform(X_test)
-
-        # Train model
-        model.fit(X_train_scaled, y_train)
-
-        # Predict
-        y_pred = model.predict(X_test_scaled)
-
-        # Metrics
-        dir_acc = direction_accuracy(y_test, y_pred)
-        mae = mean_absolute_error(y_test, y_pred)
-        r2 = r2_score(y_test, y_pred)
+    scaler = StandardScaler()
+    seen = 0
+    folds = []
+    for train_idx, test_idx in tscv.split(X):
+        train_end = train_idx[-1] + 1
+        scaler.partial_fit(X[seen:train_end])
+        seen = train_end
+        X_train_scaled = scaler.transform(X[:train_end])
+        X_test_scaled = scaler.transform(X[test_idx])
+        y_test = y[test_idx]
+        folds.append((X_train_scaled, X_test_scaled, y[train_idx], y_test, np.sign(y_test)))
+
+    return folds
+
+def _fit_fold(model, X_train_scaled, X_test_scaled, y_train):
+    """Fit a fresh model on one fold and return its test-set predictions"""
+    model.fit(X_train_scaled, y_train)
+    return model.predict(X_test_scaled)
+
+def fit_all_folds(models, folds):
+    """
+    Fit every model on every pre-scaled fold in one joblib batch
 
-        direction_accs.append(dir_acc)
-        maes.append(mae)
-        r2s.append(r2)
+    All (model, fold) fits are independent, so a single loky pool balances
+    the slow tree fits against the fast linear ones across workers. cuML
+    models are fitted in this process instead, so the GPU gets one CUDA
+    context rather than one per worker.
+    Returns {model_name: [test-set predictions per fold]}.
+    """
+    gpu_names = [name for name, model in models.items()
+                 if HAVE_CUML and isinstance(model, cuRandomForestRegressor)]
+    cpu_names = [name for name in models if name not in gpu_names]
+
+    jobs = [(models[name], fold) for name in cpu_names for fold in folds]
+    preds = Parallel(n_jobs=min(len(jobs), os.cpu_count() or 1), backend='loky')(
+        delayed(_fit_fold)(clone(model), X_train_scaled, X_test_scaled, y_train)
+        for model, (X_train_scaled, X_test_scaled, y_train, _, _) in jobs
+    )
+    n = len(folds)
+    predictions = {name: preds[i * n:(i + 1) * n] for i, name in enumerate(cpu_names)}
+
+    for name in gpu_names:
+        predictions[name] = [
+            _fit_fold(clone(models[name]), X_train_scaled, X_test_scaled, y_train)
+            for X_train_scaled, X_test_scaled, y_train, _, _ in folds
+        ]
+    return predictions
+
+def evaluate_model(fold_preds, folds, model_name):
+    """Score a model's per-fold predictions (see fit_all_folds) on the CV folds"""
+    print(f"\n🔬 Evaluating {model_name}...")
 
+    # Gather all folds' test targets and predictions, then score every fold
+    # in one vectorized pass (segment sums via reduceat at the fold starts)
+    y_true = np.concatenate([fold[3] for fold in folds])
+    y_true_sign = np.concatenate([fold[4] for fold in folds])
+    y_pred = np.concatenate(fold_preds)
+    sizes = np.array([len(p) for p in fold_preds])
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+
+    errors = y_true - y_pred
+    hits = np.add.reduceat((y_true_sign == np.sign(y_pred)).astype(np.intp), starts)
+    fold_means = np.add.reduceat(y_true, starts) / sizes
+    ss_res = np.add.reduceat(errors ** 2, starts)
+    ss_tot = np.add.reduceat((y_true - np.repeat(fold_means, sizes)) ** 2, starts)
+
+    direction_accs = hits / sizes * 100
+    maes = np.add.reduceat(np.abs(errors), starts) / sizes
+    r2s = 1 - ss_res / ss_tot
+
+    for fold, (dir_acc, mae, r2) in enumerate(zip(direction_accs, maes, r2s), 1):
         print(f"   Fold {fold}: Direction={dir_acc:.1f}%, MAE={mae:.3f}, R²={r2:.3f}")
 
     # Average metrics
@@ -155,13 +244,19 @@ def evaluate_model(model, X, y, model_name, cv_splits=5):
     }
 
 def feature_importance_analysis(X, y, feature_names):
-    """Analyze feature importance using Random Forest"""
+    """
+    Analyze feature importance using Random Forest
+
+    The forest has the final model's depth and warm_start=True, so
+    train_final_model can grow it to full size instead of starting over.
+    Returns (importances, rf, scaler).
+    """
     print("\n🎯 Feature Importance Analysis...")
 
     # Use Random Forest to get importances
-    rf = RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=-1)
+    rf = RandomForestRegressor(n_estimators=100, max_depth=10, warm_start=True, random_state=42, n_jobs=-1)
     scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X.values if hasattr(X, 'values') else X)
+    X_scaled = scaler.fit_transform(X)
     rf.fit(X_scaled, y)
 
     # Get importances
@@ -169,18 +264,25 @@ def feature_importance_analysis(X, y, feature_names):
     indices = np.argsort(importances)[::-1]
 
     print("\n   Top 15 Most Important Features:")
-    for i in range(min(15, len(feature_names))):
-        idx = indices[i]
-        print(f"   {i+1:2d}. {feature_names[idx]:<30s}: {importances[idx]:.4f}")
+    top = indices[:15]
+    for i, (name, importance) in enumerate(zip(np.asarray(feature_names)[top].tolist(),
+                                               importances[top].tolist()), 1):
+        print(f"   {i:2d}. {name:<30s}: {importance:.4f}")
+
+    return importances, rf, scaler
 
-    return feature_names, importances
+def train_final_model(X, y, feature_names, model_type='RandomForest', warm_forest=None, scaler=None):
+    """
+    Train final model on all data and save it
 
-def train_final_model(X, y, feature_names, model_type='RandomForest'):
-    """Train final model on all data and save it"""
+    warm_forest/scaler come from feature_importance_analysis on the same
+    data; a RandomForest final model adds trees to that forest.
+    """
     print(f"\n🏆 Training final {model_type} model on full dataset...")
 
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X.values if hasattr(X, 'values') else X)
+    if scaler is None:
+        scaler = StandardScaler().fit(X)
+    X_scaled = scaler.transform(X)
 
     if model_type == 'Ridge':
         model = Ridge(alpha=1.0)
@@ -188,14 +290,18 @@ def train_final_model(X, y, feature_names, model_type='RandomForest'):
         model = Lasso(alpha=0.1)
     elif model_type == 'ElasticNet':
         model = ElasticNet(alpha=0.1, l1_ratio=0.5)
+    elif model_type == 'RandomForest' and warm_forest is not None:
+        model = warm_forest.set_params(n_estimators=200)
     elif model_type == 'RandomForest':
         model = RandomForestRegressor(n_estimators=200, max_depth=10, random_state=42, n_jobs=-1)
     elif model_type == 'GradientBoosting':
-        model = GradientBoostingRegressor(n_estimators=200, max_depth=5, random_state=42)
+        model = HistGradientBoostingRegressor(max_iter=200, max_depth=5, random_state=42)
     else:
         model = LinearRegression()
 
     model.fit(X_scaled, y)
+    if model is warm_forest:
+        model.set_params(warm_start=False)
 
     # Show coefficients for linear models
     if hasattr(model, 'coef_'):
@@ -204,22 +310,29 @@ def train_final_model(X, y, feature_names, model_type='RandomForest'):
         abs_coefs = np.abs(coefs)
         indices = np.argsort(abs_coefs)[::-1]
 
-        for i in range(min(15, len(feature_names))):
-            idx = indices[i]
-            sign = '+' if coefs[idx] > 0 else ''
-            print(f"   {feature_names[idx]:<30s}: {sign}{coefs[idx]:.6f}")
+        top = indices[:15]
+        for name, coef in zip(np.asarray(feature_names)[top].tolist(), coefs[top].tolist()):
+            sign = '+' if coef > 0 else ''
+            print(f"   {name:<30s}: {sign}{coef:.6f}")
 
         print(f"\n   Intercept: {model.intercept_:.6f}")
 
     # Show feature importances for tree models
-    elif hasattr(model, 'feature_importances_'):
-        print("\n   Feature Importances (Top 15):")
-        importances = model.feature_importances_
+    else:
+        if hasattr(model, 'feature_importances_'):
+            print("\n   Feature Importances (Top 15):")
+            importances = model.feature_importances_
+        else:
+            # HistGradientBoosting has no impurity importances, so use permutation
+            print("\n   Permutation Importances (Top 15, mean R² drop):")
+            importances = permutation_importance(
+                model, X_scaled, y, n_repeats=5, n_jobs=-1, random_state=42
+            ).importances_mean
         indices = np.argsort(importances)[::-1]
 
-        for i in range(min(15, len(feature_names))):
-            idx = indices[i]
-            print(f"   {feature_names[idx]:<30s}: {importances[idx]:.6f}")
+        top = indices[:15]
+        for name, importance in zip(np.asarray(feature_names)[top].tolist(), importances[top].tolist()):
+            print(f"   {name:<30s}: {importance:.6f}")
 
     return model, scaler
 
@@ -232,17 +345,17 @@ def main():
     df = load_data()
 
     # Prepare features WITH concernLevel (champion model)
-    X, y, feature_names = prepare_features(df, use_concern=True)
+    X, y, feature_names, fill_medians = prepare_features(df, use_concern=True)
 
     # Show data stats
     print(f"\n📈 Target Statistics:")
     print(f"   Mean return: {np.mean(y):.2f}%")
     print(f"   Std dev: {np.std(y):.2f}%")
     print(f"   Min: {np.min(y):.2f}%, Max: {np.max(y):.2f}%")
-    print(f"   % Positive: {(y > 0).sum() / len(y) * 100:.1f}%")
+    print(f"   % Positive: {np.count_nonzero(y > 0) / y.size * 100:.1f}%")
 
     # Feature importance
-    feature_importance_analysis(X, y, feature_names)
+    _, importance_rf, importance_scaler = feature_importance_analysis(X, y, feature_names)
 
     # Test multiple models
     print("\n" + "=" * 80)
@@ -254,13 +367,17 @@ def main():
         'Ridge (L2)': Ridge(alpha=1.0),
         'Lasso (L1)': Lasso(alpha=0.1, max_iter=5000),
         'ElasticNet': ElasticNet(alpha=0.1, l1_ratio=0.5, max_iter=5000),
-        'RandomForest': RandomForestRegressor(n_estimators=100, max_depth=10, random_state=42, n_jobs=-1),
-        'GradientBoosting': GradientBoostingRegressor(n_estimators=100, max_depth=5, random_state=42)
+        'RandomForest': make_random_forest(n_estimators=100),
+        'GradientBoosting': HistGradientBoostingRegressor(max_iter=100, max_depth=5, random_state=42)
     }
 
+    folds = scale_folds(X, y, cv_splits=5)
+
+    predictions = fit_all_folds(models, folds)
+
     results = []
-    for name, model in models.items():
-        result = evaluate_model(model, X, y, name, cv_splits=5)
+    for name in models:
+        result = evaluate_model(predictions[name], folds, name)
         results.append(result)
 
     # Summary table
@@ -282,21 +399,22 @@ def main():
 
     # Train final model
     model_type = best_result['model_name'].split()[0]
-    final_model, final_scaler = train_final_model(X, y, feature_names, model_type)
+    final_model, final_scaler = train_final_model(X, y, feature_names, model_type,
+                                                 warm_forest=importance_rf, scaler=importance_scaler)
 
     # Save the champion model
     print("\n💾 Saving champion model...")
-    with open('models/champion_model.pkl', 'wb') as f:
-        pickle.dump({
-            'model': final_model,
-            'scaler': final_scaler,
-            'feature_names': feature_names,
-            'model_type': model_type,
-            'direction_accuracy': best_result['direction_accuracy'],
-            'mae': best_result['mae'],
-            'r2': best_result['r2'],
-            'uses_concern_level': True
-        }, f)
+    joblib.dump({
+        'model': final_model,
+        'scaler': final_scaler,
+        'feature_names': feature_names,
+        'fill_medians': fill_medians.to_dict(),  # Same NaN fills at inference
+        'model_type': model_type,
+        'direction_accuracy': best_result['direction_accuracy'],
+        'mae': best_result['mae'],
+        'r2': best_result['r2'],
+        'uses_concern_level': True
+    }, 'models/champion_model.pkl', compress=3)
 
     print("   ✅ Saved to models/champion_model.pkl")
 
@@ -305,23 +423,23 @@ def main():
     print("   SEGMENT ANALYSIS")
     print("=" * 80)
 
-    # By market cap
+    # By market cap: row indices per segment from one groupby, features scaled
+    # once with the final model's scaler instead of refitting per segment
+    segment_rows = df.groupby('marketCapCategory', observed=True).indices
+    X_scaled = final_scaler.transform(X)
     for segment in ['mega', 'large', 'mid', 'small']:
-        mask = df['marketCapCategory'] == segment
-        if mask.sum() > 10:  # At least 10 samples
-            X_seg = X[mask].values if hasattr(X, 'values') else X[mask]
-            y_seg = y[mask]
-
-            scaler = StandardScaler()
-            X_seg_scaled = scaler.fit_transform(X_seg)
+        idx = segment_rows.get(segment, [])
+        if len(idx) > 10:  # At least 10 samples
+            X_seg_scaled = X_scaled[idx]
+            y_seg = y[idx]
 
             # Use best model type
             if model_type == 'Ridge':
                 model = Ridge(alpha=1.0)
             elif model_type == 'RandomForest':
-                model = RandomForestRegressor(n_estimators=100, max_depth=10, random_state=42)
+                model = make_random_forest(n_estimators=100)
             elif model_type == 'GradientBoosting':
-                model = GradientBoostingRegressor(n_estimators=100, max_depth=5, random_state=42)
+                model = HistGradientBoostingRegressor(max_iter=100, max_depth=5, random_state=42)
             else:
                 model = LinearRegression()
 
@@ -331,7 +449,7 @@ def main():
             dir_acc = direction_accuracy(y_seg, y_pred)
             mae = mean_absolute_error(y_seg, y_pred)
 
-            print(f"\n   {segment.upper()}-CAP ({mask.sum()} samples):")
+            print(f"\n   {segment.upper()}-CAP ({len(idx)} samples):")
             print(f"      Direction Accuracy: {dir_acc:.1f}%")
             print(f"      MAE: {mae:.3f}")
 
@@ -347,7 +465,6 @@ def main():
 
 if __name__ == '__main__':
     # Create models directory if it doesn't exist
-    import os
     os.makedirs('models', exist_ok=True)
 
     main()
@@ -15,13 +15,21 @@ See: EXPERIMENTAL_SUMMARY.md for research details
 
 import pandas as pd
 import numpy as np
+# Intel-optimized scikit-learn kernels when scikit-learn-intelex is installed;
+# must run before the sklearn imports below
+try:
+    from sklearnex import patch_sklearn
+    patch_sklearn()
+except ImportError:
+    pass
 from sklearn.linear_model import LogisticRegression
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import (accuracy_score, roc_auc_score, precision_score,
                             recall_score, f1_score, confusion_matrix,
                             classification_report)
-import pickle
+import joblib
 import json
+import os
 from datetime import datetime
 import sys
 
@@ -54,7 +62,10 @@ def load_cleaned_data(csv_file):
     print("="*80)
     print(f"\n📊 Loading cleaned data from {csv_file}...")
 
-    df = pd.read_csv(csv_file)
+    if csv_file.endswith('.parquet'):
+        df = pd.read_parquet(csv_file)
+    else:
+        df = pd.read_csv(csv_file)
     df['filingDate'] = pd.to_datetime(df['filingDate'])
     df = df.sort_values('filingDate')  # Chronological order
 
@@ -90,7 +101,8 @@ def prepare_features(df):
 
     print(f"  ✅ Features: {len(BASELINE_FEATURES)}")
     print(f"  ✅ Samples: {len(X)}")
-    print(f"  ✅ Positive class: {y.sum()} ({y.mean()*100:.1f}%)")
+    n_positive = np.count_nonzero(y.to_numpy())
+    print(f"  ✅ Positive class: {n_positive} ({n_positive / len(y) * 100:.1f}%)")
 
     return X, y
 
@@ -207,9 +219,10 @@ def evaluate_model(model, scaler, X_test, y_test, test_df):
     }).sort_values('coefficient', key=abs, ascending=False)
 
     print(f"\n📊 Feature Importance (Coefficients):")
-    for _, row in feature_importance.iterrows():
-        direction = "📈" if row['coefficient'] > 0 else "📉"
-        print(f"   {row['feature']:<20} {row['coefficient']:>+8.3f} {direction}")
+    for feature, coef in zip(feature_importance['feature'].tolist(),
+                             feature_importance['coefficient'].tolist()):
+        direction = "📈" if coef > 0 else "📉"
+        print(f"   {feature:<20} {coef:>+8.3f} {direction}")
 
     # Return summary
     results = {
@@ -250,13 +263,11 @@ def save_model(model, scaler, results):
     print("="*80)
 
     # Save model
-    with open('models/baseline_model.pkl', 'wb') as f:
-        pickle.dump(model, f)
+    joblib.dump(model, 'models/baseline_model.pkl', compress=3)
     print(f"\n✅ Saved model: models/baseline_model.pkl")
 
     # Save scaler
-    with open('models/baseline_scaler.pkl', 'wb') as f:
-        pickle.dump(scaler, f)
+    joblib.dump(scaler, 'models/baseline_scaler.pkl', compress=3)
     print(f"✅ Saved scaler: models/baseline_scaler.pkl")
 
     # Save feature list
@@ -315,6 +326,8 @@ def main(csv_file='model-features-final-clean.csv'):
 if __name__ == "__main__":
     if len(sys.argv) > 1:
         csv_file = sys.argv[1]
+    elif os.path.exists('model-features-final-clean.parquet'):
+        csv_file = 'model-features-final-clean.parquet'
     else:
         csv_file = 'model-features-final-clean.csv'
 